@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
+import tempfile
 
 
 class Settings(BaseSettings):
@@ -23,10 +24,48 @@ class Settings(BaseSettings):
     # NLP settings
     max_text_length: int = 500
     min_text_length: int = 10
+    sentiment_lexicon_path: str = ""  # "term<TAB>weight" file, empty = built-in
     
     # Cache settings
     cache_ttl_seconds: int = 300  # 5 minutes
     
+    # Columnar (msgpack) batch settings
+    columnar_batch_max_tweets: int = 10000
+    
+    # Author risk store
+    author_risk_capacity: int = 100000  # authors kept (LRU eviction)
+    author_risk_alpha: float = 0.3  # EWMA weight of the newest score
+    
+    # Topic clustering (hashtag co-occurrence merge)
+    topic_merge_min_similarity: float = 0.2  # cosine
+    topic_merge_min_cooccurrence: int = 3
+    
+    # Shared-link campaign index (URLs/domains per time bucket)
+    link_index_capacity: int = 100000  # URL + domain keys kept (LRU within 4-slot sets)
+    link_bucket_seconds: int = 60
+    link_window_buckets: int = 5  # burst window = 5 buckets
+    link_burst_min_authors: int = 10  # accounts sharing a link to flag a burst
+    
+    # WebSocket detection channel
+    ws_credit_window: int = 256  # tweets in flight per connection
+    ws_max_rejected: int = 64  # rejected messages in a row before closing (1008)
+    
+    # Trending job settings
+    trending_sync_max_tweets: int = 1000  # larger windows must use jobs
+    trending_job_workers: int = 2
+    trending_job_max_pending: int = 20
+    
+    # Multi-worker shared state (counters + result cache in shared memory)
+    shared_state_enabled: bool = False
+    shared_state_dir: str = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    shared_state_prefix: str = "buzzspy"
+    shared_cache_capacity: int = 65536  # result cache slots
+    
+    # State persistence settings (warm restarts)
+    state_store_backend: str = "sqlite"  # sqlite, file, none
+    state_store_path: str = "data/state.db"  # directory for "file" backend
+    state_snapshot_interval_seconds: int = 60
+    
     class Config:
         env_file = ".env"
 
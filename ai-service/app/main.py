@@ -1,8 +1,16 @@
-from fastapi import FastAPI, HTTPException
+# Imported first so startup timings include everything below
+from app.utils.profiling import startup_profile
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import os
 from datetime import datetime
+from typing import Type, TypeVar
 
 from app.config import settings
 from app.schemas.tweet import (
@@ -12,8 +20,25 @@ from app.schemas.tweet import (
     BatchDetectionResponse,
     TrendingTopicRequest,
     TrendingTopicsResponse,
+    TrendingJobResponse,
+    AuthorRisk,
+    AuthorRiskLookupRequest,
+    AuthorRiskLookupResponse,
+    LinkShareStats,
+)
+from app.schemas.columnar import (
+    MSGPACK_CONTENT_TYPES,
+    decode_msgpack_batch,
+    encode_msgpack,
+    is_msgpack,
 )
 from app.services.detection import detection_service
+from app.services.author_risk import author_risk_store
+from app.services.link_index import link_index
+from app.services.state_store import state_manager, create_state_store
+from app.services.trending_jobs import trending_job_manager, JobQueueFullError
+from app.services.warmup import warmup, is_ready
+from app.services.ws_channel import DetectionChannel
 
 
 @asynccontextmanager
@@ -32,12 +57,34 @@ async def lifespan(app: FastAPI):
     else:
         print("💻 Running locally")
     
+    # Restore state from the last snapshot (warm start)
+    state_manager.register("detection_service", detection_service)
+    if not settings.shared_state_enabled:
+        # Per-worker store: workers would overwrite each other's snapshot
+        state_manager.register("author_risk", author_risk_store)
+    state_manager.register("link_index", link_index)
+    state_manager.open(create_state_store(
+        settings.state_store_backend,
+        settings.state_store_path,
+    ))
+    restored = state_manager.restore()
+    if restored:
+        print(f"♻️  Restored state: {', '.join(restored)}")
+    state_manager.start(settings.state_snapshot_interval_seconds)
+    
+    # Prime lazy imports and caches; /health reports ready afterwards
+    warmup_task = asyncio.create_task(warmup())
+    
+    startup_profile.mark("startup_complete")
     print("✅ AI Service ready!")
     
     yield
     
     # Shutdown
     print("🛑 Shutting down AI Service...")
+    warmup_task.cancel()
+    trending_job_manager.shutdown()
+    await state_manager.stop()
 
 
 # Create FastAPI app
@@ -58,6 +105,54 @@ app.add_middleware(
 )
 
 
+startup_profile.mark("app_imported")
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+async def parse_json_body(http_request: Request, model: Type[ModelT]) -> ModelT:
+    """Validate a JSON body like FastAPI would for a declared body model"""
+    try:
+        return model.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        # Same error locations as a declared body parameter: ("body", ...)
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors()
+        ])
+
+
+async def parse_msgpack_body(http_request: Request):
+    """Decode a columnar msgpack body, 400 on malformed input"""
+    try:
+        return decode_msgpack_batch(await http_request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def batch_request_body(model: Type[BaseModel]) -> dict:
+    """OpenAPI request body for endpoints that negotiate JSON or msgpack"""
+    
+    columnar = {
+        "type": "object",
+        "description": "Columnar batch (parallel arrays), see README",
+    }
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                **{
+                    content_type: {"schema": columnar}
+                    for content_type in MSGPACK_CONTENT_TYPES
+                },
+            },
+        },
+    }
+
+
 # Routes
 
 @app.get("/")
@@ -71,7 +166,14 @@ async def root():
             "health": "GET /health",
             "detect_single": "POST /api/detect",
             "detect_batch": "POST /api/detect/batch",
+            "detect_stream": "WS /ws/detect",
             "analyze_trending": "POST /api/trending",
+            "submit_trending_job": "POST /api/trending/jobs",
+            "get_trending_job": "GET /api/trending/jobs/{job_id}",
+            "stream_trending_job": "GET /api/trending/jobs/{job_id}/stream",
+            "author_risk": "GET /api/authors/{author_id}/risk",
+            "author_risk_bulk": "POST /api/authors/risk",
+            "link_shares": "GET /api/links?url=...",
             "stats": "GET /api/stats",
         },
     }
@@ -79,13 +181,22 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + 'Z',
-        "service": settings.app_name,
-        "version": settings.app_version,
-    }
+    """
+    Health check endpoint
+    
+    Returns 503 until the startup warmup has finished
+    """
+    ready = is_ready()
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "healthy" if ready else "warming_up",
+            "timestamp": datetime.utcnow().isoformat() + 'Z',
+            "service": settings.app_name,
+            "version": settings.app_version,
+        },
+    )
 
 
 @app.post("/api/detect", response_model=BuzzerDetectionResponse)
@@ -94,22 +205,37 @@ async def detect_buzzer(request: BuzzerDetectionRequest):
     Detect if a single tweet is from a buzzer account
     
     Returns buzzer score (0-1) and reasons for detection
+    Set explain=false to get only the verdict (faster, no reasons)
     """
     try:
-        result = await detection_service.detect_single(request.tweet)
+        result = await detection_service.detect_single(
+            request.tweet,
+            explain=request.explain,
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/detect/batch", response_model=BatchDetectionResponse)
-async def detect_buzzers_batch(request: BatchDetectionRequest):
+@app.post(
+    "/api/detect/batch",
+    response_model=BatchDetectionResponse,
+    openapi_extra=batch_request_body(BatchDetectionRequest),
+)
+async def detect_buzzers_batch(http_request: Request):
     """
     Detect buzzers for multiple tweets in batch
     
     More efficient than calling /api/detect multiple times
+    Send Content-Type: application/x-msgpack for the columnar format
+    (response is then columnar msgpack too)
     """
     
+    if is_msgpack(http_request.headers.get("content-type", "")):
+        return await detect_buzzers_batch_columnar(http_request)
+    
+    request = await parse_json_body(http_request, BatchDetectionRequest)
+    
     if not request.tweets:
         raise HTTPException(status_code=400, detail="No tweets provided")
     
@@ -123,35 +249,227 @@ async def detect_buzzers_batch(request: BatchDetectionRequest):
         result = await detection_service.detect_batch(
             tweets=request.tweets,
             threshold=request.threshold,
+            explain=request.explain,
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/trending", response_model=TrendingTopicsResponse)
-async def analyze_trending_topics(request: TrendingTopicRequest):
+@app.websocket("/ws/detect")
+async def detect_stream(websocket: WebSocket):
+    """
+    Persistent detection channel
+    
+    Send tweets (single or batches) with correlation ids over one
+    connection; results come back asynchronously with flow-control credits
+    """
+    
+    await DetectionChannel(websocket).run()
+
+
+async def detect_buzzers_batch_columnar(http_request: Request) -> Response:
+    """Columnar msgpack variant of /api/detect/batch"""
+    
+    columns, options = await parse_msgpack_body(http_request)
+    
+    if not len(columns):
+        raise HTTPException(status_code=400, detail="No tweets provided")
+    
+    if len(columns) > settings.columnar_batch_max_tweets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {settings.columnar_batch_max_tweets} tweets per batch",
+        )
+    
+    try:
+        result = await detection_service.detect_columns(
+            columns,
+            explain=options.get("explain", True),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return Response(
+        content=encode_msgpack(result),
+        media_type=MSGPACK_CONTENT_TYPES[0],
+    )
+
+
+@app.post(
+    "/api/trending",
+    response_model=TrendingTopicsResponse,
+    openapi_extra=batch_request_body(TrendingTopicRequest),
+)
+async def analyze_trending_topics(http_request: Request):
     """
     Analyze tweets to identify trending topics
     
     Detects if trends are artificially boosted by buzzer accounts
+    Accepts JSON or columnar msgpack (Content-Type: application/x-msgpack)
     """
     
-    if not request.tweets:
+    columns = None
+    
+    if is_msgpack(http_request.headers.get("content-type", "")):
+        columns, options = await parse_msgpack_body(http_request)
+        tweet_count = len(columns)
+    else:
+        request = await parse_json_body(http_request, TrendingTopicRequest)
+        tweet_count = len(request.tweets)
+    
+    if not tweet_count:
         raise HTTPException(status_code=400, detail="No tweets provided")
     
+    if tweet_count > settings.trending_sync_max_tweets:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Maximum {settings.trending_sync_max_tweets} tweets per "
+                "request, use POST /api/trending/jobs for larger windows"
+            ),
+        )
+    
     try:
-        result = await detection_service.analyze_trending(request)
+        if columns is not None:
+            result = await detection_service.analyze_trending_columns(
+                columns,
+                min_cluster_size=options.get("min_cluster_size", 5),
+            )
+        else:
+            result = await detection_service.analyze_trending(request)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post(
+    "/api/trending/jobs",
+    response_model=TrendingJobResponse,
+    status_code=202,
+    openapi_extra=batch_request_body(TrendingTopicRequest),
+)
+async def submit_trending_job(http_request: Request):
+    """
+    Submit a trending analysis to run in the background
+    
+    Identical submissions share one job; poll or stream it by job_id
+    Accepts JSON or columnar msgpack (Content-Type: application/x-msgpack)
+    """
+    
+    if is_msgpack(http_request.headers.get("content-type", "")):
+        tweets, options = await parse_msgpack_body(http_request)
+        min_cluster_size = options.get("min_cluster_size", 5)
+    else:
+        request = await parse_json_body(http_request, TrendingTopicRequest)
+        tweets, min_cluster_size = request.tweets, request.min_cluster_size
+    
+    if not len(tweets):
+        raise HTTPException(status_code=400, detail="No tweets provided")
+    
+    try:
+        job = trending_job_manager.submit(tweets, min_cluster_size, await http_request.body())
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return job.to_response()
+
+
+@app.get("/api/trending/jobs/{job_id}", response_model=TrendingJobResponse)
+async def get_trending_job(job_id: str):
+    """Get status (and result once completed) of a trending job"""
+    
+    job = trending_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    return job.to_response()
+
+
+@app.get("/api/trending/jobs/{job_id}/stream")
+async def stream_trending_job(job_id: str):
+    """
+    Stream a trending job as Server-Sent Events
+    
+    Sends the current status, keepalive comments while running,
+    and the final job (with result) when it finishes
+    """
+    
+    job = trending_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def events():
+        yield f"event: status\ndata: {job.to_response().model_dump_json()}\n\n"
+        
+        while not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+        
+        yield f"event: {job.status}\ndata: {job.to_response().model_dump_json()}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/api/authors/{author_id}/risk", response_model=AuthorRisk)
+async def get_author_risk(author_id: str):
+    """
+    Get the running risk record of an author
+    
+    Built incrementally from every detection, no re-analysis
+    """
+    
+    record = author_risk_store.get(author_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Author not seen")
+    
+    return record
+
+
+@app.post("/api/authors/risk", response_model=AuthorRiskLookupResponse)
+async def get_author_risks(request: AuthorRiskLookupRequest):
+    """Look up risk records for many authors at once"""
+    
+    if len(request.author_ids) > 1000:
+        raise HTTPException(
+            status_code=400,
+            detail="Maximum 1000 authors per lookup"
+        )
+    
+    records = author_risk_store.get_many(request.author_ids)
+    
+    return AuthorRiskLookupResponse(
+        authors=[record for record in records.values() if record is not None],
+        missing=[author_id for author_id, record in records.items() if record is None],
+    )
+
+
+@app.get("/api/links", response_model=LinkShareStats)
+async def get_link_shares(url: str):
+    """
+    Get recent sharing of a link and its domain
+    
+    Counts come from the link index fed by every detection
+    """
+    
+    stats = link_index.lookup(url)
+    if stats is None:
+        raise HTTPException(status_code=400, detail="Invalid URL")
+    
+    return stats
+
+
 @app.get("/api/stats")
 async def get_statistics():
     """Get service statistics"""
     
     stats = detection_service.get_stats()
+    stats['trending_jobs'] = trending_job_manager.get_stats()
+    stats['author_risk'] = author_risk_store.get_stats()
+    stats['link_index'] = link_index.get_stats()
+    stats['startup'] = startup_profile.report()
     
     return {
         "success": True,
@@ -1,8 +1,8 @@
-import numpy as np
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from app.schemas.tweet import Tweet, BuzzerDetectionResponse
-from app.models.feature_extractor import feature_extractor
+from app.schemas.columnar import TweetColumns
+from app.models.feature_extractor import LinkBurst, feature_extractor
 from app.config import settings
 
 
@@ -23,16 +23,51 @@ class BuzzerDetector:
             'emoji_count': 0.05,
             'exclamation_count': 0.05,
             'retweet_ratio': 0.05,
+            'shared_link_burst': 0.20,
         }
+        
+        # Signal checks for lazy scoring (must mirror _calculate_buzzer_score)
+        # feature -> (relative extraction cost, fires when)
+        signals = {
+            'has_excessive_hashtags': (0, lambda v: v == 1.0),
+            'follower_ratio': (0, lambda v: v > 2.0),
+            'retweet_ratio': (0, lambda v: v > 0.7),
+            'is_new_account': (1, lambda v: v == 1.0),
+            'exclamation_count': (1, lambda v: v >= 3),
+            'shared_link_burst': (1, lambda v: v >= settings.link_burst_min_authors),
+            'has_buzzer_pattern': (2, lambda v: v == 1.0),
+            'caps_ratio': (2, lambda v: v > 0.3),
+            'emoji_count': (3, lambda v: v >= 5),
+        }
+        
+        # Cheapest first, heaviest weight first within the same cost
+        self.lazy_signals = sorted(
+            ((name, check) for name, (_, check) in signals.items()),
+            key=lambda item: (signals[item[0]][0], -self.weights[item[0]]),
+        )
     
-    def detect(self, tweet: Tweet) -> BuzzerDetectionResponse:
+    def detect(
+        self, 
+        tweet: Tweet,
+        explain: bool = True,
+        link_burst: Optional[LinkBurst] = None
+    ) -> BuzzerDetectionResponse:
         """
         Detect if a tweet is from a buzzer account
         Returns detection result with score and reasons
+        
+        With explain=False features are evaluated lazily and scoring stops
+        as soon as the verdict is decided; reasons and features are omitted
+        and buzzer_score is the score accumulated up to that point.
+        link_burst looks up shared-link bursts (the service's link index);
+        without it that signal never fires.
         """
         
+        if not explain:
+            return self._detect_lazy(tweet, link_burst)
+        
         # Extract features
-        features = feature_extractor.extract_features(tweet)
+        features = feature_extractor.extract_features(tweet, link_burst)
         
         # Calculate buzzer score
         score, reasons = self._calculate_buzzer_score(features)
@@ -54,6 +89,144 @@ class BuzzerDetector:
             features=features,
         )
     
+    def fired_signals(self, features: dict) -> List[str]:
+        """Names of the buzzer signals that fire for a full feature set"""
+        return [
+            name for name, check in self.lazy_signals
+            if check(features[name])
+        ]
+    
+    def _detect_lazy(
+        self,
+        tweet: Tweet,
+        link_burst: Optional[LinkBurst]
+    ) -> BuzzerDetectionResponse:
+        """Score signals in cost order, stopping once the verdict is decided"""
+        
+        threshold = settings.buzzer_threshold
+        
+        # Verified accounts get the same penalty as in the full scoring
+        multiplier = 0.5 if tweet.author.verified else 1.0
+        
+        score = 0.0
+        remaining = sum(self.weights[name] for name, _ in self.lazy_signals)
+        signal_count = int(tweet.author.verified)
+        is_buzzer = False
+        
+        for name, check in self.lazy_signals:
+            # Even every remaining signal firing cannot reach the threshold
+            if min(round((score + remaining) * multiplier, 6), 1.0) < threshold:
+                break
+            
+            weight = self.weights[name]
+            remaining -= weight
+            
+            if check(feature_extractor.extract_feature(tweet, name, link_burst)):
+                score += weight
+                signal_count += 1
+                
+                # Remaining signals can only raise the score
+                if min(round(score * multiplier, 6), 1.0) >= threshold:
+                    is_buzzer = True
+                    break
+        
+        score = min(round(score * multiplier, 6), 1.0)
+        confidence = self._confidence_for_signals(signal_count)
+        
+        return BuzzerDetectionResponse(
+            tweet_id=tweet.id,
+            buzzer_score=round(score, 3),
+            is_buzzer=is_buzzer,
+            reasons=[],
+            cluster_id=None,
+            confidence=round(confidence, 3),
+            analyzed_at=datetime.utcnow().isoformat() + 'Z',
+            features=None,
+        )
+    
+    def detect_columns(
+        self, 
+        columns: TweetColumns,
+        explain: bool = True,
+        link_burst: Optional[LinkBurst] = None
+    ) -> Dict[str, Any]:
+        """
+        Detect buzzers for a columnar batch without per-tweet objects
+        
+        Returns parallel lists: buzzer_scores, is_buzzer, confidences and,
+        with explain=True, reasons and signals (fired signal names). With
+        explain=False signals are evaluated column-wise in cost order and
+        only for rows still undecided.
+        """
+        import numpy as np
+        
+        if explain:
+            features = feature_extractor.extract_columns(
+                columns,
+                feature_extractor.feature_names,
+                link_burst=link_burst,
+            )
+            
+            scores, reasons, signals = [], [], []
+            for i in range(len(columns)):
+                row = {name: float(values[i]) for name, values in features.items()}
+                score, row_reasons = self._calculate_buzzer_score(row)
+                scores.append(round(score, 3))
+                reasons.append(row_reasons)
+                signals.append(self.fired_signals(row))
+            
+            return {
+                'buzzer_scores': scores,
+                'is_buzzer': [s >= settings.buzzer_threshold for s in scores],
+                'confidences': [
+                    round(self._confidence_for_signals(len(r)), 3)
+                    for r in reasons
+                ],
+                'reasons': reasons,
+                'signals': signals,
+            }
+        
+        threshold = settings.buzzer_threshold
+        verified = np.array(columns.verified, dtype=bool)
+        multiplier = np.where(verified, 0.5, 1.0)
+        
+        score = np.zeros(len(columns))
+        signal_count = verified.astype(np.int64)
+        remaining = sum(self.weights[name] for name, _ in self.lazy_signals)
+        undecided = np.arange(len(columns))
+        
+        for name, check in self.lazy_signals:
+            # Drop rows whose verdict can no longer change
+            current = np.minimum(np.round(score[undecided] * multiplier[undecided], 6), 1.0)
+            upper = np.minimum(np.round((score[undecided] + remaining) * multiplier[undecided], 6), 1.0)
+            undecided = undecided[(current < threshold) & (upper >= threshold)]
+            
+            if len(undecided) == 0:
+                break
+            
+            weight = self.weights[name]
+            remaining -= weight
+            
+            values = feature_extractor.extract_columns(
+                columns, [name], undecided, link_burst
+            )[name]
+            fired = check(values)
+            score[undecided] += weight * fired
+            signal_count[undecided] += fired
+        
+        score = np.minimum(np.round(score * multiplier, 6), 1.0)
+        
+        return {
+            'buzzer_scores': np.round(score, 3).tolist(),
+            'is_buzzer': (score >= threshold).tolist(),
+            'confidences': [
+                self._confidence_for_signals(int(count))
+                for count in signal_count
+            ],
+            'reasons': None,
+            'signals': None,
+        }
+    
     def _calculate_buzzer_score(
         self, 
         features: dict
@@ -112,12 +285,20 @@ class BuzzerDetector:
             score += self.weights['retweet_ratio']
             reasons.append("Unusually high retweet ratio")
         
+        # Check: Same link pushed by many accounts at once
+        if features['shared_link_burst'] >= settings.link_burst_min_authors:
+            score += self.weights['shared_link_burst']
+            count = int(features['shared_link_burst'])
+            minutes = settings.link_bucket_seconds * settings.link_window_buckets // 60
+            reasons.append(f"Link shared by ~{count} accounts in {minutes} min")
+        
         # Verified accounts get penalty (less likely to be buzzer)
         if features['is_verified'] == 1.0:
             score *= 0.5
             reasons.append("Verified account (lower risk)")
         
-        return min(score, 1.0), reasons
+        # Rounded so lazy scoring, which adds weights in another order, agrees
+        return min(round(score, 6), 1.0), reasons
     
     def _calculate_confidence(
         self, 
@@ -130,7 +311,10 @@ class BuzzerDetector:
         """
         
         # Base confidence on number of signals
-        signal_count = len(reasons)
+        return self._confidence_for_signals(len(reasons))
+    
+    def _confidence_for_signals(self, signal_count: int) -> float:
+        """Map number of fired signals to a confidence level"""
         
         if signal_count == 0:
             return 0.5  # Low confidence (no signals)
@@ -145,13 +329,15 @@ class BuzzerDetector:
     
     def batch_detect(
         self, 
-        tweets: List[Tweet]
+        tweets: List[Tweet],
+        explain: bool = True,
+        link_burst: Optional[LinkBurst] = None
     ) -> List[BuzzerDetectionResponse]:
         """Detect buzzers in batch"""
         
         results = []
         for tweet in tweets:
-            result = self.detect(tweet)
+            result = self.detect(tweet, explain=explain, link_burst=link_burst)
             results.append(result)
         
         return results
@@ -1,11 +1,15 @@
 import re
 from datetime import datetime, timezone
-from typing import Dict, List
-import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence
 from app.schemas.tweet import Tweet, Author
+from app.schemas.columnar import TweetColumns
 from app.config import settings
 
 
+# Shared-link burst of a tweet's URLs, looked up in service state
+LinkBurst = Callable[[Sequence[str]], float]
+
+
 class FeatureExtractor:
     """Extract features from tweets for buzzer detection"""
     
@@ -22,40 +26,187 @@ class FeatureExtractor:
     # Kata-kata yang sering di-capitalize buzzer
     CAPS_TRIGGERS = ['BREAKING', 'URGENT', 'VIRAL', 'HOAX', 'FAKTA']
     
-    def extract_features(self, tweet: Tweet) -> Dict[str, float]:
-        """Extract all features from a tweet"""
-        
-        features = {
+    # Prebuilt at import so no request pays for compiling them
+    BUZZER_REGEX = re.compile('|'.join(BUZZER_PATTERNS))
+    
+    # Simple emoji detection using unicode ranges
+    EMOJI_PATTERN = re.compile(
+        "["
+        u"\U0001F600-\U0001F64F"  # emoticons
+        u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+        u"\U0001F680-\U0001F6FF"  # transport & map symbols
+        u"\U0001F1E0-\U0001F1FF"  # flags
+        u"\U00002702-\U000027B0"
+        u"\U000024C2-\U0001F251"
+        "]+", flags=re.UNICODE
+    )
+    
+    def __init__(self):
+        # Feature name -> extractor, in the order features are reported
+        self._extractors = {
             # Account features
-            'account_age_days': self._get_account_age(tweet.author),
-            'follower_ratio': self._get_follower_ratio(tweet.author),
-            'is_new_account': self._is_new_account(tweet.author),
-            'is_verified': float(tweet.author.verified),
+            'account_age_days': lambda t: self._get_account_age(t.author),
+            'follower_ratio': lambda t: self._get_follower_ratio(t.author),
+            'is_new_account': lambda t: self._is_new_account(t.author),
+            'is_verified': lambda t: float(t.author.verified),
             
             # Content features
-            'text_length': len(tweet.text),
-            'hashtag_count': len(tweet.entities.hashtags),
-            'mention_count': len(tweet.entities.mentions),
-            'url_count': len(tweet.entities.urls),
-            'has_excessive_hashtags': float(len(tweet.entities.hashtags) >= 4),
+            'text_length': lambda t: len(t.text),
+            'hashtag_count': lambda t: len(t.entities.hashtags),
+            'mention_count': lambda t: len(t.entities.mentions),
+            'url_count': lambda t: len(t.entities.urls),
+            'has_excessive_hashtags': lambda t: float(len(t.entities.hashtags) >= 4),
             
             # Pattern features
-            'has_buzzer_pattern': self._has_buzzer_pattern(tweet.text),
-            'caps_ratio': self._calculate_caps_ratio(tweet.text),
-            'emoji_count': self._count_emojis(tweet.text),
-            'exclamation_count': tweet.text.count('!'),
+            'has_buzzer_pattern': lambda t: self._has_buzzer_pattern(t.text),
+            'caps_ratio': lambda t: self._calculate_caps_ratio(t.text),
+            'emoji_count': lambda t: self._count_emojis(t.text),
+            'exclamation_count': lambda t: t.text.count('!'),
             
             # Engagement features (normalized)
-            'engagement_rate': self._calculate_engagement_rate(tweet),
-            'retweet_ratio': self._calculate_retweet_ratio(tweet),
+            'engagement_rate': self._calculate_engagement_rate,
+            'retweet_ratio': self._calculate_retweet_ratio,
         }
         
+        # Features that need service state: callers pass the lookup in,
+        # without it they are 0 (signal off)
+        self._lookups = {
+            'shared_link_burst': lambda t, link_burst: link_burst(t.entities.urls),
+        }
+    
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self._extractors) + list(self._lookups)
+    
+    def extract_features(
+        self,
+        tweet: Tweet,
+        link_burst: Optional[LinkBurst] = None
+    ) -> Dict[str, float]:
+        """Extract all features from a tweet"""
+        
+        features = {
+            name: extractor(tweet)
+            for name, extractor in self._extractors.items()
+        }
+        for name in self._lookups:
+            features[name] = self.extract_feature(tweet, name, link_burst)
+        
         return features
     
+    def extract_feature(
+        self,
+        tweet: Tweet,
+        name: str,
+        link_burst: Optional[LinkBurst] = None
+    ) -> float:
+        """
+        Extract a single feature by name
+        Lets lazy scoring compute only the features it needs
+        """
+        if name in self._lookups:
+            return self._lookups[name](tweet, link_burst) if link_burst else 0.0
+        return self._extractors[name](tweet)
+    
+    def extract_columns(
+        self, 
+        columns: TweetColumns,
+        names: Sequence[str],
+        rows: Optional["np.ndarray"] = None,
+        link_burst: Optional[LinkBurst] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Extract features for a columnar batch, one array per feature
+        Only `rows` (indices) are computed when given
+        """
+        import numpy as np
+        
+        if rows is None:
+            rows = np.arange(len(columns))
+        
+        def column(name: str, dtype=None) -> np.ndarray:
+            values = getattr(columns, name)
+            return np.array([values[i] for i in rows], dtype=dtype)
+        
+        def per_text(func) -> np.ndarray:
+            return np.array(
+                [func(columns.texts[i]) for i in rows],
+                dtype=np.float64,
+            )
+        
+        def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            out = np.zeros(len(rows))
+            np.divide(numerator, denominator, out=out, where=denominator != 0)
+            return out
+        
+        def account_age() -> np.ndarray:
+            return np.array(
+                [self._age_from_iso(columns.author_created_at[i]) for i in rows],
+                dtype=np.float64,
+            )
+        
+        def follower_ratio() -> np.ndarray:
+            followers = column('followers', np.float64)
+            following = column('following', np.float64)
+            return np.where(
+                followers == 0,
+                10.0,
+                np.minimum(ratio(following, followers), 10.0),
+            )
+        
+        def total_engagement() -> np.ndarray:
+            return (
+                column('likes', np.float64)
+                + column('retweets', np.float64)
+                + column('replies', np.float64)
+            )
+        
+        def list_len(name: str) -> np.ndarray:
+            values = getattr(columns, name)
+            return np.array([len(values[i]) for i in rows], dtype=np.float64)
+        
+        extractors = {
+            'account_age_days': account_age,
+            'follower_ratio': follower_ratio,
+            'is_new_account': lambda: (
+                account_age() < settings.min_account_age_days
+            ).astype(np.float64),
+            'is_verified': lambda: column('verified', np.float64),
+            'text_length': lambda: per_text(len),
+            'hashtag_count': lambda: list_len('hashtags'),
+            'mention_count': lambda: list_len('mentions'),
+            'url_count': lambda: list_len('urls'),
+            'has_excessive_hashtags': lambda: (
+                list_len('hashtags') >= 4
+            ).astype(np.float64),
+            'shared_link_burst': lambda: np.array(
+                [link_burst(columns.urls[i]) if link_burst else 0.0 for i in rows],
+                dtype=np.float64,
+            ),
+            'has_buzzer_pattern': lambda: per_text(self._has_buzzer_pattern),
+            'caps_ratio': lambda: per_text(self._calculate_caps_ratio),
+            'emoji_count': lambda: per_text(self._count_emojis),
+            'exclamation_count': lambda: per_text(lambda text: text.count('!')),
+            'engagement_rate': lambda: np.minimum(
+                ratio(total_engagement(), column('views', np.float64)),
+                1.0,
+            ),
+            'retweet_ratio': lambda: ratio(
+                column('retweets', np.float64),
+                total_engagement(),
+            ),
+        }
+        
+        return {name: extractors[name]() for name in names}
+    
     def _get_account_age(self, author: Author) -> float:
         """Calculate account age in days"""
+        return self._age_from_iso(author.created_at)
+    
+    def _age_from_iso(self, created_at: str) -> float:
+        """Days since an ISO timestamp"""
         try:
-            created = datetime.fromisoformat(author.created_at.replace('Z', '+00:00'))
+            created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
             age = (datetime.now(timezone.utc) - created).days
             return float(age)
         except:
@@ -76,13 +227,7 @@ class FeatureExtractor:
     
     def _has_buzzer_pattern(self, text: str) -> float:
         """Check for common buzzer patterns"""
-        text_upper = text.upper()
-        
-        for pattern in self.BUZZER_PATTERNS:
-            if re.search(pattern, text_upper):
-                return 1.0
-        
-        return 0.0
+        return float(self.BUZZER_REGEX.search(text.upper()) is not None)
     
     def _calculate_caps_ratio(self, text: str) -> float:
         """Calculate ratio of CAPS words (buzzers love CAPS)"""
@@ -95,19 +240,7 @@ class FeatureExtractor:
     
     def _count_emojis(self, text: str) -> float:
         """Count emojis (buzzers often use excessive emojis)"""
-        # Simple emoji detection using unicode ranges
-        emoji_pattern = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags
-            u"\U00002702-\U000027B0"
-            u"\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE
-        )
-        
-        emojis = emoji_pattern.findall(text)
+        emojis = self.EMOJI_PATTERN.findall(text)
         return float(len(emojis))
     
     def _calculate_engagement_rate(self, tweet: Tweet) -> float:
@@ -138,8 +271,11 @@ class FeatureExtractor:
         
         return tweet.metrics.retweets / total_engagement
     
-    def get_feature_vector(self, tweet: Tweet) -> np.ndarray:
+    def get_feature_vector(self, tweet: Tweet) -> "np.ndarray":
         """Get feature vector as numpy array for ML model"""
+        # numpy is only needed here, keep it out of service startup
+        import numpy as np
+        
         features = self.extract_features(tweet)
         
         # Return features in consistent order
@@ -0,0 +1,123 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from app.utils.nlp import tokenize
+from app.config import settings
+
+
+# Default lexicon (weight > 0 positive, < 0 negative)
+DEFAULT_LEXICON = {
+    'bagus': 1.0, 'hebat': 1.0, 'sukses': 1.0, 'berhasil': 1.0,
+    'mantap': 1.0, 'luar biasa': 1.0, 'positif': 1.0, 'setuju': 1.0,
+    'mendukung': 1.0,
+    'gagal': -1.0, 'buruk': -1.0, 'salah': -1.0, 'korupsi': -1.0,
+    'hoax': -1.0, 'bohong': -1.0, 'negatif': -1.0, 'tolak': -1.0,
+    'menolak': -1.0, 'protes': -1.0,
+}
+
+
+def load_lexicon(path: str) -> Dict[str, float]:
+    """
+    Load a lexicon file with one "term<TAB>weight" per line
+    Lines starting with # are comments; malformed lines are skipped
+    with a warning rather than failing every trending analysis
+    """
+
+    lexicon = {}
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            try:
+                term, weight = line.rsplit("\t", 1)
+                lexicon[term] = float(weight)
+            except ValueError:
+                print(f"⚠️  {path}:{line_number}: expected \"term<TAB>weight\", skipped")
+
+    return lexicon
+
+
+class SentimentScorer:
+    """
+    Lexicon sentiment scoring with one sparse product
+
+    Texts are tokenized once into a sparse text x term count matrix over
+    the lexicon's own vocabulary (exact matches only, phrases as n-grams),
+    and the lexicon is a (n_terms x 2) weight matrix, so a whole cluster is
+    scored with one sparse product and per-tweet cost does not depend on
+    lexicon size.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.set_lexicon(lexicon if lexicon is not None else DEFAULT_LEXICON)
+
+    def set_lexicon(self, lexicon: Dict[str, float]) -> None:
+        """Build the vocabulary and (n_terms x 2) positive/negative weights"""
+
+        # Terms are matched as texts are tokenized: lowercase, no punctuation
+        lexicon = {
+            " ".join(tokenize(term)): weight
+            for term, weight in lexicon.items()
+        }
+        lexicon.pop("", None)
+
+        terms = [term for term, weight in lexicon.items() if weight != 0]
+
+        # Longest lexicon phrase decides which n-grams texts need
+        self.max_ngram = max(
+            (len(term.split()) for term in terms),
+            default=1,
+        )
+
+        self.vectorizer = CountVectorizer(
+            vocabulary=terms or ['_'],  # empty vocabularies are rejected
+            ngram_range=(1, self.max_ngram),
+            tokenizer=tokenize,
+            token_pattern=None,
+            lowercase=False,
+        )
+
+        weights = np.array([lexicon[term] for term in terms] or [0.0], dtype=np.float64)
+
+        self.weights = sparse.csr_matrix(np.column_stack([
+            np.clip(weights, 0, None),     # positive
+            np.clip(-weights, 0, None),    # negative
+        ]))
+
+    def _vectorize(self, texts: List[str]) -> sparse.csr_matrix:
+        return self.vectorizer.transform(texts)
+
+    def score_texts(self, texts: List[str]) -> np.ndarray:
+        """Per-text (positive, negative) lexicon totals, shape (n_texts, 2)"""
+
+        if not texts:
+            return np.zeros((0, 2))
+
+        return (self._vectorize(texts) @ self.weights).toarray()
+
+    def classify(self, texts: List[str]) -> str:
+        """Overall sentiment of a cluster: positive, negative or neutral"""
+
+        positive, negative = self.score_texts(texts).sum(axis=0)
+
+        if positive > negative * 1.5:
+            return 'positive'
+        elif negative > positive * 1.5:
+            return 'negative'
+        else:
+            return 'neutral'
+
+
+@lru_cache()
+def get_sentiment_scorer() -> SentimentScorer:
+    """Shared scorer, built on first use (loading sklearn takes a while)"""
+    if settings.sentiment_lexicon_path:
+        return SentimentScorer(load_lexicon(settings.sentiment_lexicon_path))
+    return SentimentScorer()
@@ -0,0 +1,207 @@
+import heapq
+from collections import Counter
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from app.config import settings
+
+
+class TopicClusterer:
+    """
+    Merge strongly co-occurring hashtags into topics
+
+    Builds a sparse tweet x hashtag incidence matrix X, gets co-occurrence
+    counts from X.T @ X and keeps tag pairs whose cosine similarity and
+    count pass the thresholds. Tags are then merged by complete linkage: two
+    groups join only if every tag pair across them is strong. Rotated
+    campaign tags (k tags used in pairs score 1/(k-1)) end up together,
+    while a hub like #Indonesia or #Viral, similar to tags of several topics
+    that never co-occur with each other, can join at most one topic and
+    never chains topics together the way single linkage would. Each tweet goes to the topic
+    holding most of its hashtags (its first hashtag breaks ties). Cost grows
+    with tweets x hashtags-per-tweet², i.e. near-linear.
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = None,
+        min_cooccurrence: int = None
+    ):
+        self.min_similarity = (
+            min_similarity if min_similarity is not None
+            else settings.topic_merge_min_similarity
+        )
+        self.min_cooccurrence = (
+            min_cooccurrence if min_cooccurrence is not None
+            else settings.topic_merge_min_cooccurrence
+        )
+
+    def cluster(self, hashtags: Sequence[List[str]]) -> Dict[str, List[int]]:
+        """
+        Group tweet rows by merged topic
+        Returns {topic label: row indices}; tweets without hashtags are skipped
+        """
+
+        # Hashtags match case-insensitively; labels keep the most used spelling
+        vocabulary: Dict[str, int] = {}
+        spellings: List[Counter] = []
+        indptr = [0]
+        indices: List[int] = []
+        first_tag: List[int] = []
+
+        for tags in hashtags:
+            row = []
+            for tag in tags:
+                key = tag.lower()
+                index = vocabulary.get(key)
+                if index is None:
+                    index = vocabulary[key] = len(vocabulary)
+                    spellings.append(Counter())
+                spellings[index][tag] += 1
+                if index not in row:
+                    row.append(index)
+
+            indices.extend(row)
+            indptr.append(len(indices))
+            first_tag.append(row[0] if row else -1)
+
+        if not vocabulary:
+            return {}
+
+        incidence = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(hashtags), len(vocabulary)),
+        )
+
+        topic_of_tag = self._merge_tags(incidence)
+
+        # Hashtags per (tweet, topic), first hashtag weighted to break ties
+        first = np.array(first_tag)
+        rows_with_tags = np.flatnonzero(first >= 0)
+        tie_break = sparse.csr_matrix(
+            (np.full(len(rows_with_tags), 0.5), (rows_with_tags, first[rows_with_tags])),
+            shape=incidence.shape,
+        )
+        membership = sparse.csr_matrix(
+            (np.ones(len(vocabulary)), (np.arange(len(vocabulary)), topic_of_tag)),
+        )
+        votes = (incidence + tie_break) @ membership
+
+        topic_of_row = np.asarray(votes[rows_with_tags].argmax(axis=1)).ravel()
+
+        return self._label_groups(rows_with_tags, topic_of_row, topic_of_tag, incidence, spellings)
+
+    def _merge_tags(self, incidence: sparse.csr_matrix) -> np.ndarray:
+        """Complete-linkage merge over the strong co-occurrence pairs, topic per tag"""
+
+        cooccurrence = (incidence.T @ incidence).tocoo()
+        frequency = np.asarray(incidence.sum(axis=0)).ravel()
+
+        i, j, count = cooccurrence.row, cooccurrence.col, cooccurrence.data
+        similarity = count / np.sqrt(frequency[i] * frequency[j])
+
+        strong = (
+            (i < j)
+            & (count >= self.min_cooccurrence)
+            & (similarity >= self.min_similarity)
+        )
+
+        # Between groups: [strong tag pairs, weakest similarity among them]
+        links: Dict[int, Dict[int, list]] = {}
+        for a, b, sim in zip(i[strong].tolist(), j[strong].tolist(), similarity[strong].tolist()):
+            links.setdefault(a, {})[b] = [1, sim]
+            links.setdefault(b, {})[a] = [1, sim]
+
+        size = dict.fromkeys(links, 1)
+        parent = {tag: tag for tag in links}
+        version = dict.fromkeys(links, 0)
+
+        # Most similar first; an entry is stale once either group has changed
+        heap = [
+            (-sim, a, b, 0, 0)
+            for a, neighbours in links.items()
+            for b, (_, sim) in neighbours.items()
+            if a < b
+        ]
+        heapq.heapify(heap)
+
+        while heap:
+            _, a, b, version_a, version_b = heapq.heappop(heap)
+            if version.get(a) != version_a or version.get(b) != version_b:
+                continue
+
+            # Fold the smaller group into the larger one
+            if size[a] < size[b]:
+                a, b = b, a
+
+            parent[b] = a
+            size[a] += size.pop(b)
+            version[a] += 1
+            del version[b]
+
+            merged = links.pop(b)
+            merged.pop(a, None)
+            links[a].pop(b, None)
+
+            for c, (pairs, weakest) in merged.items():
+                del links[c][b]
+                current = links[a].get(c)
+                if current is not None:
+                    pairs += current[0]
+                    weakest = min(weakest, current[1])
+                links[a][c] = links[c][a] = [pairs, weakest]
+
+            # Only groups fully linked to the merged group can join it later
+            for c, (pairs, weakest) in links[a].items():
+                if pairs == size[a] * size[c]:
+                    heapq.heappush(heap, (-weakest, a, c, version[a], version[c]))
+
+        def root(tag: int) -> int:
+            while parent[tag] != tag:
+                tag = parent[tag]
+            return tag
+
+        # Unmerged tags are their own topic; renumber topics 0..n-1
+        topic_of_tag = np.arange(incidence.shape[1])
+        for tag in parent:
+            topic_of_tag[tag] = root(tag)
+
+        _, topic_of_tag = np.unique(topic_of_tag, return_inverse=True)
+        return topic_of_tag
+
+    def _label_groups(
+        self,
+        rows: np.ndarray,
+        topic_of_row: np.ndarray,
+        topic_of_tag: np.ndarray,
+        incidence: sparse.csr_matrix,
+        spellings: List[Counter]
+    ) -> Dict[str, List[int]]:
+        """Name each topic after its hashtag used most by the topic's own tweets"""
+
+        # Tweets per (topic, tag), counting only tweets assigned to the topic
+        assignment = sparse.csr_matrix(
+            (np.ones(len(rows)), (np.arange(len(rows)), topic_of_row)),
+            shape=(len(rows), topic_of_tag.max() + 1),
+        )
+        usage = (assignment.T @ incidence[rows]).tocoo()
+        own = topic_of_tag[usage.col] == usage.row
+
+        # Most used own tag per topic (lowest index on ties)
+        topic, tag, count = usage.row[own], usage.col[own], usage.data[own]
+        label_tag = {}
+        for index in np.lexsort((tag, -count)):
+            label_tag.setdefault(topic[index], tag[index])
+
+        # Split rows by topic in one sort (keeps row order within a topic)
+        order = np.argsort(topic_of_row, kind='stable')
+        topics, starts = np.unique(topic_of_row[order], return_index=True)
+        
+        groups: Dict[str, List[int]] = {}
+        for topic, members in zip(topics, np.split(rows[order], starts[1:])):
+            label = spellings[label_tag[topic]].most_common(1)[0][0]
+            groups[label] = members.tolist()
+
+        return groups
@@ -0,0 +1,160 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.schemas.tweet import Tweet
+
+
+MSGPACK_CONTENT_TYPES = ("application/x-msgpack", "application/msgpack")
+
+# Scalar options allowed next to the columns -> accepted types
+BATCH_OPTIONS = {
+    'threshold': (int, float),
+    'explain': (bool,),
+    'min_cluster_size': (int,),
+}
+
+
+def is_msgpack(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in MSGPACK_CONTENT_TYPES
+
+
+class TweetColumns:
+    """
+    A batch of tweets as parallel arrays, one list per field
+
+    The scoring and trending paths read these columns directly, so columnar
+    request bodies never become per-tweet objects.
+    """
+
+    # Column name -> element type
+    FIELDS = {
+        'ids': str,
+        'texts': str,
+        'created_at': str,
+        'author_ids': str,
+        'usernames': str,
+        'followers': int,
+        'following': int,
+        'verified': bool,
+        'author_created_at': str,
+        'likes': int,
+        'retweets': int,
+        'replies': int,
+        'views': int,
+        'hashtags': list,
+        'mentions': list,
+        'urls': list,
+    }
+
+    def __init__(self, **columns: List[Any]):
+        for name in self.FIELDS:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_tweets(cls, tweets: Sequence[Tweet]) -> "TweetColumns":
+        return cls(
+            ids=[t.id for t in tweets],
+            texts=[t.text for t in tweets],
+            created_at=[t.created_at for t in tweets],
+            author_ids=[t.author.id for t in tweets],
+            usernames=[t.author.username for t in tweets],
+            followers=[t.author.followers for t in tweets],
+            following=[t.author.following for t in tweets],
+            verified=[t.author.verified for t in tweets],
+            author_created_at=[t.author.created_at for t in tweets],
+            likes=[t.metrics.likes for t in tweets],
+            retweets=[t.metrics.retweets for t in tweets],
+            replies=[t.metrics.replies for t in tweets],
+            views=[t.metrics.views for t in tweets],
+            hashtags=[t.entities.hashtags for t in tweets],
+            mentions=[t.entities.mentions for t in tweets],
+            urls=[t.entities.urls for t in tweets],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TweetColumns":
+        """
+        Validate a decoded columnar payload
+        Raises ValueError on missing, mistyped or misaligned columns
+        """
+
+        columns = {}
+        length = None
+
+        for name, kind in cls.FIELDS.items():
+            column = data.get(name)
+            if not isinstance(column, list):
+                raise ValueError(f"Column '{name}' must be an array")
+
+            if length is None:
+                length = len(column)
+            elif len(column) != length:
+                raise ValueError(
+                    f"Column '{name}' has {len(column)} items, expected {length}"
+                )
+
+            # bool is an int subclass; ints are accepted for bool columns
+            allowed = (int, bool) if kind in (int, bool) else kind
+            if not all(isinstance(value, allowed) for value in column):
+                raise ValueError(f"Column '{name}' must contain {kind.__name__} values")
+
+            if kind is list and not all(
+                isinstance(item, str) for value in column for item in value
+            ):
+                raise ValueError(f"Column '{name}' must contain arrays of strings")
+
+            columns[name] = column
+
+        return cls(**columns)
+
+    def take(self, rows: Sequence[int]) -> "TweetColumns":
+        """Subset of rows, in the given order"""
+        return TweetColumns(**{
+            name: [getattr(self, name)[i] for i in rows]
+            for name in self.FIELDS
+        })
+
+
+def decode_msgpack_batch(body: bytes) -> Tuple[TweetColumns, Dict[str, Any]]:
+    """
+    Decode a msgpack columnar body
+
+    The body is a map with one array per TweetColumns field plus optional
+    scalar options (threshold, explain, min_cluster_size).
+    Returns (columns, options). Raises ValueError on malformed input.
+    """
+
+    import msgpack
+
+    try:
+        data = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise ValueError(f"Invalid msgpack body: {e}")
+
+    if not isinstance(data, dict):
+        raise ValueError("Msgpack body must be a map of columns")
+
+    options = {
+        key: value for key, value in data.items()
+        if key not in TweetColumns.FIELDS
+    }
+
+    for key, value in options.items():
+        allowed = BATCH_OPTIONS.get(key)
+        if allowed is None:
+            continue  # Unknown options are ignored, as in JSON bodies
+
+        # bool is an int subclass; only explain takes booleans
+        if not isinstance(value, allowed) or (isinstance(value, bool) and bool not in allowed):
+            names = " or ".join(kind.__name__ for kind in allowed)
+            raise ValueError(f"Option '{key}' must be {names}")
+
+    return TweetColumns.from_dict(data), options
+
+
+def encode_msgpack(data: Dict[str, Any]) -> bytes:
+    import msgpack
+
+    return msgpack.packb(data, use_bin_type=True)
@@ -37,6 +37,7 @@ class Tweet(BaseModel):
 
 class BuzzerDetectionRequest(BaseModel):
     tweet: Tweet
+    explain: bool = True  # False = lazy scoring, no reasons/features
 
 
 class BuzzerDetectionResponse(BaseModel):
@@ -53,6 +54,7 @@ class BuzzerDetectionResponse(BaseModel):
 class BatchDetectionRequest(BaseModel):
     tweets: List[Tweet]
     threshold: float = 0.7
+    explain: bool = True  # False = lazy scoring, no reasons/features
 
 
 class BatchDetectionResponse(BaseModel):
@@ -79,4 +81,43 @@ class TrendingTopic(BaseModel):
 class TrendingTopicsResponse(BaseModel):
     topics: List[TrendingTopic]
     analyzed_count: int
-    timestamp: str
\ No newline at end of file
+    timestamp: str
+
+
+class AuthorRisk(BaseModel):
+    author_id: str
+    risk_score: Optional[float] = None  # EWMA of explained buzzer scores
+    tweet_count: int
+    buzzer_count: int
+    buzzer_rate: float
+    last_seen: str
+    top_reasons: List[str]
+
+
+class AuthorRiskLookupRequest(BaseModel):
+    author_ids: List[str]
+
+
+class AuthorRiskLookupResponse(BaseModel):
+    authors: List[AuthorRisk]
+    missing: List[str]
+
+
+class LinkShareStats(BaseModel):
+    url: str  # normalized
+    domain: str
+    url_tweets: int  # in the current window
+    url_authors: float  # distinct-author estimate
+    url_authors_previous: Optional[float] = None  # None: previous window not fully seen
+    domain_tweets: int
+    domain_authors: float
+    domain_authors_previous: Optional[float] = None
+
+
+class TrendingJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed
+    submitted_at: str
+    completed_at: Optional[str] = None
+    result: Optional[TrendingTopicsResponse] = None
+    error: Optional[str] = None
\ No newline at end of file
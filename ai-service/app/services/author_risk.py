@@ -0,0 +1,215 @@
+import math
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.models.buzzer_detector import buzzer_detector
+from app.services.shared_state import stable_hash
+from app.config import settings
+
+
+# Reason codes tracked per author (buzzer signal names)
+REASON_CODES = list(buzzer_detector.weights)
+
+
+class AuthorRiskStore:
+    """
+    Running per-author risk, updated incrementally on every detection
+
+    Records live in preallocated flat arrays indexed by slot; an LRU-ordered
+    dict maps author id -> slot, so updates and lookups are O(1) and the
+    least recently seen author's slot is reused once capacity is reached.
+    Recently counted tweet ids are kept in a direct-mapped table, so a
+    re-sent tweet doesn't count twice (on either detection path).
+    """
+
+    def __init__(self, capacity: int = None, alpha: float = None):
+        self.capacity = capacity or settings.author_risk_capacity
+        self.alpha = alpha if alpha is not None else settings.author_risk_alpha
+        self._code_index = {code: i for i, code in enumerate(REASON_CODES)}
+
+        n = self.capacity
+        self._score_ewma = array('f', [math.nan]) * n  # NaN: no explained detection yet
+        self._tweet_count = array('I', [0]) * n
+        self._buzzer_count = array('I', [0]) * n
+        self._last_seen = array('d', [0.0]) * n
+        self._reason_counts = array('I', [0]) * (n * len(REASON_CODES))
+
+        # Hashes of recently counted tweet ids; a colliding newer tweet
+        # overwrites the slot, which at worst lets an old retry count again
+        self._seen_tweets = array('Q', [0]) * n
+
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._author_of_slot: List[Optional[str]] = [None] * n
+        self._free = list(range(n - 1, -1, -1))
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _slot_for(self, author_id: str) -> int:
+        """Slot of an author, allocating (and evicting if full) on first sight"""
+
+        slot = self._slots.get(author_id)
+        if slot is not None:
+            self._slots.move_to_end(author_id)
+            return slot
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self.evictions += 1
+
+        self._score_ewma[slot] = math.nan
+        self._tweet_count[slot] = 0
+        self._buzzer_count[slot] = 0
+        self._last_seen[slot] = 0.0
+        width = len(REASON_CODES)
+        self._reason_counts[slot * width:(slot + 1) * width] = array('I', [0]) * width
+
+        self._slots[author_id] = slot
+        self._author_of_slot[slot] = author_id
+        return slot
+
+    def update(
+        self,
+        author_id: str,
+        tweet_id: str,
+        is_buzzer: bool,
+        score: Optional[float] = None,
+        reason_codes: Sequence[str] = (),
+        seen_at: Optional[float] = None
+    ) -> None:
+        """
+        Fold one detection into the author's record, once per tweet id
+        score/reason_codes come from explained detections only; verdict-only
+        detections stop early, so their partial score is not folded in
+        """
+
+        h = stable_hash(tweet_id)
+        seen = h % len(self._seen_tweets)
+        if self._seen_tweets[seen] == h:
+            return
+        self._seen_tweets[seen] = h
+
+        slot = self._slot_for(author_id)
+
+        self._tweet_count[slot] += 1
+        if is_buzzer:
+            self._buzzer_count[slot] += 1
+        self._last_seen[slot] = seen_at if seen_at is not None else time.time()
+
+        if score is not None:
+            previous = self._score_ewma[slot]
+            self._score_ewma[slot] = (
+                score if math.isnan(previous)
+                else self.alpha * score + (1 - self.alpha) * previous
+            )
+
+        base = slot * len(REASON_CODES)
+        for code in reason_codes:
+            index = self._code_index.get(code)
+            if index is not None:
+                self._reason_counts[base + index] += 1
+
+    def get(self, author_id: str, top_reasons: int = 3) -> Optional[dict]:
+        """Current record of an author, None if unknown (or evicted)"""
+
+        slot = self._slots.get(author_id)
+        if slot is None:
+            return None
+
+        base = slot * len(REASON_CODES)
+        counts = self._reason_counts[base:base + len(REASON_CODES)]
+        ranked = sorted(
+            (i for i in range(len(REASON_CODES)) if counts[i] > 0),
+            key=lambda i: -counts[i],
+        )
+
+        score = self._score_ewma[slot]
+        tweet_count = self._tweet_count[slot]
+
+        return {
+            'author_id': author_id,
+            'risk_score': None if math.isnan(score) else round(score, 3),
+            'tweet_count': tweet_count,
+            'buzzer_count': self._buzzer_count[slot],
+            'buzzer_rate': round(self._buzzer_count[slot] / tweet_count, 3),
+            'last_seen': datetime.utcfromtimestamp(self._last_seen[slot]).isoformat() + 'Z',
+            'top_reasons': [REASON_CODES[i] for i in ranked[:top_reasons]],
+        }
+
+    def get_many(self, author_ids: Sequence[str]) -> Dict[str, Optional[dict]]:
+        return {author_id: self.get(author_id) for author_id in author_ids}
+
+    def get_stats(self) -> dict:
+        return {
+            'authors': len(self._slots),
+            'capacity': self.capacity,
+            'evictions': self.evictions,
+        }
+
+    def get_state(self) -> Callable[[], dict]:
+        """
+        Snapshot all records, least recently seen first
+        Copies the arrays here; the records are built by the returned callable
+        """
+
+        # Slicing copies each whole buffer at once; walking the LRU dict
+        # would cost far more, so records are ordered by last_seen instead
+        authors = self._author_of_slot[:]
+        score_ewma = self._score_ewma[:]
+        tweet_count = self._tweet_count[:]
+        buzzer_count = self._buzzer_count[:]
+        last_seen = self._last_seen[:]
+        reason_counts = self._reason_counts[:]
+
+        def build() -> dict:
+            width = len(REASON_CODES)
+            slots = sorted(
+                (slot for slot, author_id in enumerate(authors) if author_id is not None),
+                key=last_seen.__getitem__,
+            )
+
+            records = []
+            for slot in slots:
+                author_id = authors[slot]
+                score = score_ewma[slot]
+                records.append([
+                    author_id,
+                    None if math.isnan(score) else score,
+                    tweet_count[slot],
+                    buzzer_count[slot],
+                    last_seen[slot],
+                    list(reason_counts[slot * width:(slot + 1) * width]),
+                ])
+
+            return {'reason_codes': REASON_CODES, 'records': records}
+
+        return build
+
+    def load_state(self, state: dict) -> None:
+        """Restore records; LRU order is preserved, overflow drops the oldest"""
+
+        codes = state.get('reason_codes', REASON_CODES)
+        records = state.get('records', [])[-self.capacity:]
+
+        for author_id, score, tweet_count, buzzer_count, last_seen, reasons in records:
+            slot = self._slot_for(author_id)
+            self._score_ewma[slot] = math.nan if score is None else score
+            self._tweet_count[slot] = tweet_count
+            self._buzzer_count[slot] = buzzer_count
+            self._last_seen[slot] = last_seen
+
+            base = slot * len(REASON_CODES)
+            for code, count in zip(codes, reasons):
+                index = self._code_index.get(code)
+                if index is not None:
+                    self._reason_counts[base + index] = count
+
+
+# Singleton instance
+author_risk_store = AuthorRiskStore()
@@ -7,8 +7,18 @@ from app.schemas.tweet import (
     TrendingTopicsResponse,
     TrendingTopicRequest,
 )
+from app.schemas.columnar import TweetColumns
 from app.models.buzzer_detector import buzzer_detector
 from app.services.trending import trending_analyzer
+from app.services.author_risk import author_risk_store
+from app.services.link_index import link_index
+from app.services.shared_state import (
+    SharedCounters,
+    SharedResultCache,
+    shared_path,
+)
+from app.utils.profiling import startup_profile
+from app.config import settings
 from datetime import datetime
 
 
@@ -16,41 +26,108 @@ class DetectionService:
     """Main service for buzzer detection and analysis"""
     
     def __init__(self):
-        self.total_analyzed = 0
-        self.total_buzzers_detected = 0
+        # Shared across uvicorn workers when shared_state_enabled
+        self.counters = SharedCounters(
+            ['total_analyzed', 'total_buzzers_detected'],
+            path=shared_path('counters'),
+        )
+        
+        # Verdict-only results by tweet id: (score, is_buzzer, confidence)
+        self.result_cache = SharedResultCache(
+            capacity=settings.shared_cache_capacity,
+            width=3,
+            path=shared_path('results'),
+        )
     
-    async def detect_single(self, tweet: Tweet) -> BuzzerDetectionResponse:
+    @property
+    def total_analyzed(self) -> int:
+        return self.counters.get('total_analyzed')
+    
+    @property
+    def total_buzzers_detected(self) -> int:
+        return self.counters.get('total_buzzers_detected')
+    
+    def _detect(self, tweet: Tweet, explain: bool) -> BuzzerDetectionResponse:
+        """Detect one tweet, serving verdict-only requests from the cache"""
+        
+        if explain:
+            link_index.record(tweet.entities.urls, tweet.author.id)
+            result = buzzer_detector.detect(tweet, link_burst=link_index.burst)
+            author_risk_store.update(
+                tweet.author.id,
+                tweet.id,
+                result.is_buzzer,
+                score=result.buzzer_score,
+                reason_codes=buzzer_detector.fired_signals(result.features),
+            )
+            return result
+        
+        cached = self.result_cache.get(
+            tweet.id,
+            max_age=settings.cache_ttl_seconds,
+        )
+        
+        # Cache hits are tweets seen within the TTL: not counted again per author
+        if cached is not None:
+            (score, is_buzzer, confidence), stored_at = cached
+            return BuzzerDetectionResponse(
+                tweet_id=tweet.id,
+                buzzer_score=score,
+                is_buzzer=bool(is_buzzer),
+                reasons=[],
+                confidence=confidence,
+                analyzed_at=datetime.utcfromtimestamp(stored_at).isoformat() + 'Z',
+            )
+        
+        link_index.record(tweet.entities.urls, tweet.author.id)
+        result = buzzer_detector.detect(tweet, explain=False, link_burst=link_index.burst)
+        self.result_cache.put(
+            tweet.id,
+            (result.buzzer_score, float(result.is_buzzer), result.confidence),
+        )
+        author_risk_store.update(tweet.author.id, tweet.id, result.is_buzzer)
+        
+        return result
+    
+    async def detect_single(
+        self, 
+        tweet: Tweet,
+        explain: bool = True
+    ) -> BuzzerDetectionResponse:
         """Detect buzzer for single tweet"""
         
-        self.total_analyzed += 1
-        result = buzzer_detector.detect(tweet)
+        result = self._detect(tweet, explain)
         
+        self.counters.add('total_analyzed')
         if result.is_buzzer:
-            self.total_buzzers_detected += 1
+            self.counters.add('total_buzzers_detected')
         
+        startup_profile.mark('first_detection')
         return result
     
     async def detect_batch(
         self, 
         tweets: List[Tweet],
-        threshold: float = 0.7
+        threshold: float = 0.7,
+        explain: bool = True
     ) -> BatchDetectionResponse:
         """Detect buzzers for multiple tweets"""
         
         start_time = time.time()
         
         # Detect all tweets
-        results = buzzer_detector.batch_detect(tweets)
+        results = [self._detect(tweet, explain) for tweet in tweets]
         
         # Count buzzers
         buzzer_count = sum(1 for r in results if r.is_buzzer)
         buzzer_rate = (buzzer_count / len(tweets)) if tweets else 0.0
         
         # Update stats
-        self.total_analyzed += len(tweets)
-        self.total_buzzers_detected += buzzer_count
+        self.counters.add('total_analyzed', len(tweets))
+        self.counters.add('total_buzzers_detected', buzzer_count)
         
         processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        startup_profile.mark('first_detection')
         
         return BatchDetectionResponse(
             results=results,
@@ -59,6 +136,52 @@ class DetectionService:
             processing_time_ms=round(processing_time, 2),
         )
     
+    async def detect_columns(
+        self, 
+        columns: TweetColumns,
+        explain: bool = True
+    ) -> dict:
+        """Detect buzzers for a columnar batch, results as parallel lists"""
+        
+        start_time = time.time()
+        
+        # Index the whole batch first so a campaign inside it is visible
+        for urls, author_id in zip(columns.urls, columns.author_ids):
+            link_index.record(urls, author_id)
+        
+        result = buzzer_detector.detect_columns(
+            columns,
+            explain=explain,
+            link_burst=link_index.burst,
+        )
+        
+        for i, author_id in enumerate(columns.author_ids):
+            author_risk_store.update(
+                author_id,
+                columns.ids[i],
+                result['is_buzzer'][i],
+                score=result['buzzer_scores'][i] if explain else None,
+                reason_codes=result['signals'][i] if explain else (),
+            )
+        
+        buzzer_count = sum(result['is_buzzer'])
+        buzzer_rate = (buzzer_count / len(columns)) if len(columns) else 0.0
+        
+        # Update stats
+        self.counters.add('total_analyzed', len(columns))
+        self.counters.add('total_buzzers_detected', buzzer_count)
+        
+        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        startup_profile.mark('first_detection')
+        
+        return {
+            'tweet_ids': columns.ids,
+            **result,
+            'total_buzzers': buzzer_count,
+            'buzzer_rate': round(buzzer_rate, 3),
+            'processing_time_ms': round(processing_time, 2),
+        }
+    
     async def analyze_trending(
         self, 
         request: TrendingTopicRequest
@@ -76,18 +199,59 @@ class DetectionService:
             timestamp=datetime.utcnow().isoformat() + 'Z',
         )
     
+    async def analyze_trending_columns(
+        self, 
+        columns: TweetColumns,
+        min_cluster_size: int = 5
+    ) -> TrendingTopicsResponse:
+        """Analyze trending topics from a columnar batch"""
+        
+        topics = trending_analyzer.analyze_columns(
+            columns,
+            min_cluster_size=min_cluster_size,
+        )
+        
+        return TrendingTopicsResponse(
+            topics=topics,
+            analyzed_count=len(columns),
+            timestamp=datetime.utcnow().isoformat() + 'Z',
+        )
+    
     def get_stats(self) -> dict:
         """Get service statistics"""
         
+        total_analyzed = self.total_analyzed
+        total_buzzers = self.total_buzzers_detected
+        
         return {
-            'total_analyzed': self.total_analyzed,
-            'total_buzzers_detected': self.total_buzzers_detected,
+            'total_analyzed': total_analyzed,
+            'total_buzzers_detected': total_buzzers,
             'buzzer_rate': (
-                round(self.total_buzzers_detected / self.total_analyzed, 3)
-                if self.total_analyzed > 0
+                round(total_buzzers / total_analyzed, 3)
+                if total_analyzed > 0
                 else 0.0
             ),
+            'result_cache': self.result_cache.get_stats(),  # this worker
         }
+    
+    def get_state(self) -> dict:
+        """Snapshot counters for warm restarts"""
+        
+        return {
+            'total_analyzed': self.total_analyzed,
+            'total_buzzers_detected': self.total_buzzers_detected,
+        }
+    
+    def load_state(self, state: dict) -> None:
+        """
+        Restore counters from a snapshot
+        Shared counters are only seeded once, by the first worker to start
+        """
+        
+        self.counters.restore({
+            'total_analyzed': int(state.get('total_analyzed', 0)),
+            'total_buzzers_detected': int(state.get('total_buzzers_detected', 0)),
+        })
 
 
 # Singleton instance
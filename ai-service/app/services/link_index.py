@@ -0,0 +1,398 @@
+import math
+import time
+from array import array
+from typing import Callable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from app.services.shared_state import SharedSegment, shared_path, stable_hash
+from app.config import settings
+
+
+# Query parameters that only track the click, not what is linked
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src',
+    'ref_url', 's', 'si', 'feature',
+}
+
+# Distinct-author sketch: one 64-bit bitmap per bucket (linear counting)
+SKETCH_BITS = 64
+
+
+def normalize_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Canonical (url, domain) for a shared link, None if it has no host
+    Scheme, "www.", fragments, trailing slashes and tracking parameters
+    are dropped so variants of one link count together
+    """
+
+    url = url.strip()
+    if '://' not in url:
+        url = '//' + url
+
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').rstrip('.')
+    except ValueError:
+        return None
+
+    if '.' not in host or any(c.isspace() for c in host):
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+
+    path = parts.path.rstrip('/')
+    normalized = host + path + ('?' + urlencode(query) if query else '')
+    return normalized, host
+
+
+def _estimate(bitmap: int) -> float:
+    """Distinct authors behind a sketch bitmap (saturates near 266)"""
+
+    zeros = SKETCH_BITS - bin(bitmap).count('1')
+    if zeros == SKETCH_BITS:
+        return 0.0
+    if zeros == 0:
+        return SKETCH_BITS * math.log(SKETCH_BITS)
+    return -SKETCH_BITS * math.log(zeros / SKETCH_BITS)
+
+
+class LinkIndex:
+    """
+    Who is sharing which URL and domain, in recent time buckets
+
+    Every normalized URL and its domain is a hashed key with a ring of
+    per-bucket tweet counts and distinct-author sketches covering two
+    windows (current + previous). Records live in flat arrays in a shared
+    memory segment, so with shared state every worker records into and
+    reads the same index (path None: private memory, single worker).
+
+    A key maps to a set of WAYS slots and takes a free one, or the least
+    recently shared one in its set, so recording and lookups are O(1).
+    Writers (workers, and threads within one) serialize on the segment
+    lock. Readers, such as trending job threads, never lock: each slot
+    carries a seqlock version like SharedResultCache.
+    """
+
+    MAGIC = 0xB0227C2
+    WAYS = 4
+    READ_RETRIES = 3
+
+    # Segment-wide counters
+    _CLOCK, _KEYS, _EVICTIONS = range(3)
+
+    def __init__(
+        self,
+        capacity: int = None,
+        bucket_seconds: int = None,
+        window_buckets: int = None,
+        path: Optional[str] = None,
+    ):
+        self.bucket_seconds = bucket_seconds or settings.link_bucket_seconds
+        self.window_buckets = window_buckets or settings.link_window_buckets
+        self.ring = 2 * self.window_buckets
+
+        capacity = capacity or settings.link_index_capacity
+        self.n_sets = -(-capacity // self.WAYS)
+        self.capacity = n = self.n_sets * self.WAYS
+
+        self._segment = SharedSegment(
+            path,
+            size=8 * (3 + 5 * n + 2 * n * self.ring),
+            layout=(self.MAGIC, n, self.bucket_seconds, self.ring),
+        )
+        arrays = [('_stats', 3, 'Q')] + [
+            (name, n, fmt) for name, fmt in (
+                ('_versions', 'Q'),     # odd while a writer updates the slot
+                ('_key_of_slot', 'Q'),  # 0: free slot
+                ('_touched', 'Q'),      # clock value of the last share (LRU)
+                ('_head', 'q'),         # newest bucket number
+                ('_first', 'q'),        # bucket the key was first seen in
+            )
+        ] + [('_counts', n * self.ring, 'q'), ('_sketches', n * self.ring, 'Q')]
+
+        offset = 0
+        for name, count, fmt in arrays:
+            setattr(self, name, self._segment.array(offset, count, fmt))
+            offset += count * 8
+
+    def __len__(self) -> int:
+        return self._stats[self._KEYS]
+
+    @property
+    def evictions(self) -> int:
+        return self._stats[self._EVICTIONS]
+
+    def _bucket(self, now: Optional[float]) -> int:
+        return int((now if now is not None else time.time()) // self.bucket_seconds)
+
+    @staticmethod
+    def _keys(urls: Iterable[str]) -> Tuple[List[int], List[int]]:
+        """Hashed (url keys, domain keys) of a tweet, each link counted once"""
+
+        url_keys, domain_keys = set(), set()
+        for url in urls:
+            normalized = normalize_url(url)
+            if normalized is not None:
+                url_keys.add(stable_hash('u:' + normalized[0]))
+                domain_keys.add(stable_hash('d:' + normalized[1]))
+        return list(url_keys), list(domain_keys)
+
+    def _find(self, key: int) -> Optional[int]:
+        base = key % self.n_sets * self.WAYS
+        for slot in range(base, base + self.WAYS):
+            if self._key_of_slot[slot] == key:
+                return slot
+        return None
+
+    def _slot_for(self, key: int, bucket: int) -> int:
+        """
+        Slot of a key advanced to `bucket`, taking a free or the least
+        recently shared slot of its set on first sight
+        Call with the segment lock held; the slot's version is left odd
+        for the caller to bump once it has written
+        """
+
+        base = key % self.n_sets * self.WAYS
+        slot, victim = None, base
+        for candidate in range(base, base + self.WAYS):
+            if self._key_of_slot[candidate] == key:
+                slot = candidate
+                break
+            if self._touched[candidate] < self._touched[victim]:
+                victim = candidate
+
+        self._stats[self._CLOCK] += 1
+        if slot is None:
+            slot = victim
+            self._versions[slot] += 1  # odd: write in progress
+            if self._key_of_slot[slot]:
+                self._stats[self._EVICTIONS] += 1
+            else:
+                self._stats[self._KEYS] += 1
+
+            cells = slice(slot * self.ring, (slot + 1) * self.ring)
+            self._counts[cells] = array('q', [0]) * self.ring
+            self._sketches[cells] = array('Q', [0]) * self.ring
+            self._key_of_slot[slot] = key
+            self._head[slot] = bucket
+            self._first[slot] = bucket
+        else:
+            self._versions[slot] += 1
+
+            # Clear the buckets that fell out of the ring since the last share
+            head = self._head[slot]
+            if bucket > head:
+                base = slot * self.ring
+                for b in range(head + 1, head + 1 + min(bucket - head, self.ring)):
+                    self._counts[base + b % self.ring] = 0
+                    self._sketches[base + b % self.ring] = 0
+                self._head[slot] = bucket
+
+        self._touched[slot] = self._stats[self._CLOCK]
+        return slot
+
+    def record(self, urls: Iterable[str], author_id: str, now: Optional[float] = None) -> None:
+        """Count one tweet's links for its author"""
+
+        url_keys, domain_keys = self._keys(urls)
+        if not url_keys:
+            return
+
+        bucket = self._bucket(now)
+        bit = 1 << (stable_hash(author_id) % SKETCH_BITS)
+
+        with self._segment.lock():
+            for key in url_keys + domain_keys:
+                slot = self._slot_for(key, bucket)
+
+                # Late arrivals older than the ring are dropped
+                if self._head[slot] - bucket < self.ring:
+                    cell = slot * self.ring + bucket % self.ring
+                    self._counts[cell] += 1
+                    self._sketches[cell] |= bit
+
+                self._versions[slot] += 1
+
+    def _read_windows(self, slot: int, key: int, bucket: int) -> Optional[Tuple[int, int, Optional[int]]]:
+        """One (possibly torn) read of a slot's windows, None if it holds another key"""
+
+        if self._key_of_slot[slot] != key:
+            return None
+
+        head = self._head[slot]
+        base = slot * self.ring
+        tweets, current, previous = 0, 0, 0
+
+        for b in range(max(head - self.ring + 1, bucket - self.ring + 1), min(head, bucket) + 1):
+            cell = base + b % self.ring
+            if bucket - b < self.window_buckets:
+                tweets += self._counts[cell]
+                current |= self._sketches[cell]
+            else:
+                previous |= self._sketches[cell]
+
+        # Seen too recently (new, evicted or restarted without a snapshot)
+        if bucket - self._first[slot] < self.ring - 1:
+            return tweets, current, None
+
+        return tweets, current, previous
+
+    def _windows(self, key: int, bucket: int) -> Tuple[int, int, Optional[int]]:
+        """
+        (tweets, author sketch) of the current window and the sketch of the
+        previous one, None unless the key was tracked for that whole window
+        """
+
+        slot = self._find(key)
+        if slot is None:
+            return 0, 0, None
+
+        for _ in range(self.READ_RETRIES):
+            version = self._versions[slot]
+            if version & 1:
+                continue
+
+            windows = self._read_windows(slot, key, bucket)
+            if self._versions[slot] == version:
+                return windows or (0, 0, None)
+
+        # A writer keeps getting in the way: wait for it
+        with self._segment.lock():
+            return self._read_windows(slot, key, bucket) or (0, 0, None)
+
+    def lookup(self, url: str, now: Optional[float] = None) -> Optional[dict]:
+        """Current window stats of a link and its domain, None if not a URL"""
+
+        normalized = normalize_url(url)
+        if normalized is None:
+            return None
+
+        bucket = self._bucket(now)
+        stats = {'url': normalized[0], 'domain': normalized[1]}
+
+        for level, key in (('url', 'u:' + normalized[0]), ('domain', 'd:' + normalized[1])):
+            tweets, current, previous = self._windows(stable_hash(key), bucket)
+            stats[f'{level}_tweets'] = tweets
+            stats[f'{level}_authors'] = round(_estimate(current), 1)
+            stats[f'{level}_authors_previous'] = (
+                None if previous is None else round(_estimate(previous), 1)
+            )
+
+        return stats
+
+    def burst(self, urls: Iterable[str], now: Optional[float] = None) -> float:
+        """
+        Shared-link burst of a tweet: estimated accounts pushing its links
+        in the current window. A URL counts all its recent authors; a domain
+        only counts its growth over the previous window, so domains that are
+        always shared (news sites, YouTube) don't light up. Domains without a
+        fully observed previous window (just seen, evicted, or after a cold
+        start) don't count at all.
+        """
+
+        url_keys, domain_keys = self._keys(urls)
+        if not url_keys:
+            return 0.0
+
+        bucket = self._bucket(now)
+        burst = 0.0
+
+        for key in url_keys:
+            _, current, _ = self._windows(key, bucket)
+            burst = max(burst, _estimate(current))
+
+        for key in domain_keys:
+            _, current, previous = self._windows(key, bucket)
+            if previous is not None:
+                burst = max(burst, _estimate(current) - _estimate(previous))
+
+        return round(burst, 1)
+
+    def get_stats(self) -> dict:
+        return {
+            'keys': len(self),
+            'capacity': self.capacity,
+            'evictions': self.evictions,
+            'window_seconds': self.bucket_seconds * self.window_buckets,
+        }
+
+    def get_state(self) -> Callable[[], dict]:
+        """
+        Snapshot keys still inside the ring, least recently shared first
+        Copies the arrays here; the records are built by the returned callable
+        With shared state every worker snapshots the same, complete index
+        """
+
+        # Bytes copies of whole buffers, cheap next to building the records
+        with self._segment.lock():
+            keys, touched, head, first, counts, sketches = (
+                memoryview(bytes(view)).cast(view.format)
+                for view in (
+                    self._key_of_slot, self._touched, self._head,
+                    self._first, self._counts, self._sketches,
+                )
+            )
+
+        current = self._bucket(None)
+        ring = self.ring
+
+        def build() -> dict:
+            slots = sorted(
+                (
+                    slot for slot in range(len(keys))
+                    if keys[slot] and current - head[slot] < ring
+                ),
+                key=touched.__getitem__,
+            )
+
+            return {
+                'bucket_seconds': self.bucket_seconds,
+                'ring': ring,
+                'records': [
+                    [
+                        keys[slot],
+                        head[slot],
+                        first[slot],
+                        counts[slot * ring:(slot + 1) * ring].tolist(),
+                        sketches[slot * ring:(slot + 1) * ring].tolist(),
+                    ]
+                    for slot in slots
+                ],
+            }
+
+        return build
+
+    def load_state(self, state: dict) -> None:
+        """
+        Restore keys into an empty index (every worker restores the same
+        snapshot on startup); other bucket layouts are skipped
+        """
+
+        if (state.get('bucket_seconds'), state.get('ring')) != (self.bucket_seconds, self.ring):
+            return
+
+        current = self._bucket(None)
+        with self._segment.lock():
+            if len(self):
+                return
+
+            for key, head, first, counts, sketches in state.get('records', []):
+                if current - head >= self.ring:
+                    continue  # Nothing left inside the ring
+
+                slot = self._slot_for(key, head)
+                cells = slice(slot * self.ring, (slot + 1) * self.ring)
+                self._first[slot] = first
+                self._counts[cells] = array('q', counts)
+                self._sketches[cells] = array('Q', sketches)
+                self._versions[slot] += 1
+
+
+# Singleton instance (shared across uvicorn workers when shared_state_enabled)
+link_index = LinkIndex(path=shared_path('links'))
@@ -0,0 +1,258 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+
+HEADER_SIZE = 64  # magic + layout fields, padded
+
+
+def stable_hash(key: str) -> int:
+    """64-bit hash that is the same in every worker (hash() is salted)"""
+    h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+    return h or 1  # 0 marks an empty cache slot
+
+
+class SharedSegment:
+    """
+    A zero-initialized memory segment shared by all workers
+
+    Backed by an mmap'ed file (ideally on tmpfs such as /dev/shm), or by
+    anonymous private memory when path is None (single process). Whoever
+    opens it first, or finds a different layout, (re)initializes it under
+    an exclusive file lock.
+    """
+
+    def __init__(self, path: Optional[str], size: int, layout: Tuple[int, ...]):
+        self.path = path
+        self.size = HEADER_SIZE + size
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+        header = struct.pack(f"<{len(layout)}q", *layout)
+
+        if path is None:
+            self.mm = mmap.mmap(-1, self.size)
+            self.mm[:len(header)] = header
+        else:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            with self.lock():
+                if os.fstat(self._fd).st_size != self.size:
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, self.size)
+
+                self.mm = mmap.mmap(self._fd, self.size)
+
+                if self.mm[:len(header)] != header:
+                    self.mm[:] = bytes(self.size)
+                    self.mm[:len(header)] = header
+
+        self.view = memoryview(self.mm)[HEADER_SIZE:]
+
+    @contextmanager
+    def lock(self):
+        """Exclusive lock across workers (writers only, readers never lock)"""
+        with self._thread_lock:
+            if self._fd is None:
+                yield
+                return
+
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def array(self, offset: int, count: int, fmt: str) -> memoryview:
+        """Typed view of count items ('q' int64, 'Q' uint64, 'd' float64)"""
+        return self.view[offset:offset + count * 8].cast(fmt)
+
+
+class SharedCounters:
+    """
+    Monotonic counters summed across workers
+
+    Each worker owns one slot and is its only writer, so increments need no
+    lock and readers just sum the slots. Slot 0 holds restored totals; slots
+    of dead workers are reused, keeping their counts.
+    """
+
+    MAGIC = 0xB0227C0
+
+    def __init__(self, names: List[str], path: Optional[str] = None, max_workers: int = 64):
+        self.names = names
+        self._index = {name: i for i, name in enumerate(names)}
+        self.n_slots = max_workers + 1
+
+        self._segment = SharedSegment(
+            path,
+            size=self.n_slots * 8 * (1 + len(names)),
+            layout=(self.MAGIC, self.n_slots, len(names)),
+        )
+        self._pids = self._segment.array(0, self.n_slots, 'q')
+        self._counts = self._segment.array(self.n_slots * 8, self.n_slots * len(names), 'q')
+
+        self._pid: Optional[int] = None
+        self._slot = 0
+
+    def _claim_slot(self) -> int:
+        """Find this process's slot (done lazily, so forked workers get their own)"""
+
+        pid = os.getpid()
+
+        with self._segment.lock():
+            free = None
+            for slot in range(1, self.n_slots):
+                owner = self._pids[slot]
+                if owner == pid:
+                    free = slot
+                    break
+                if free is None and (owner == 0 or not _pid_alive(owner)):
+                    free = slot
+
+            if free is None:
+                raise RuntimeError(f"No free counter slot for worker {pid}")
+
+            self._pids[free] = pid
+
+        self._pid = pid
+        return free
+
+    def add(self, name: str, amount: int = 1) -> None:
+        if self._pid != os.getpid():
+            self._slot = self._claim_slot()
+
+        self._counts[self._slot * len(self.names) + self._index[name]] += amount
+
+    def get(self, name: str) -> int:
+        index = self._index[name]
+        width = len(self.names)
+        return sum(self._counts[slot * width + index] for slot in range(self.n_slots))
+
+    def restore(self, values: Dict[str, int]) -> bool:
+        """
+        Seed totals from a snapshot, only if nothing has been counted yet
+        (every worker restores the same snapshot on startup)
+        """
+
+        with self._segment.lock():
+            if any(self._counts[i] for i in range(len(self._counts))):
+                return False
+
+            for name, value in values.items():
+                if name in self._index:
+                    self._counts[self._index[name]] = int(value)
+
+        return True
+
+
+class SharedResultCache:
+    """
+    Fixed-size, direct-mapped cache of float records keyed by string
+
+    Readers are lock-free: each slot carries a seqlock version that writers
+    make odd while updating, and a read is discarded if the version was odd
+    or changed underneath it. Writers serialize on the segment lock.
+    """
+
+    MAGIC = 0xB0227C1
+
+    def __init__(self, capacity: int, width: int, path: Optional[str] = None):
+        self.capacity = capacity
+        self.width = width
+
+        # Per slot: version, key hash, stored_at, then `width` values
+        self._segment = SharedSegment(
+            path,
+            size=capacity * 8 * (3 + width),
+            layout=(self.MAGIC, capacity, width),
+        )
+        offset = 0
+        self._versions = self._segment.array(offset, capacity, 'Q')
+        offset += capacity * 8
+        self._keys = self._segment.array(offset, capacity, 'Q')
+        offset += capacity * 8
+        self._stored_at = self._segment.array(offset, capacity, 'd')
+        offset += capacity * 8
+        self._values = self._segment.array(offset, capacity * width, 'd')
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Tuple[Tuple[float, ...], float]]:
+        """Returns (values, stored_at) or None"""
+
+        h = stable_hash(key)
+        slot = h % self.capacity
+        start = slot * self.width
+
+        version = self._versions[slot]
+        if version & 1 or self._keys[slot] != h:
+            self.misses += 1
+            return None
+
+        values = tuple(self._values[start:start + self.width])
+        stored_at = self._stored_at[slot]
+
+        # Torn read or stale entry
+        if self._versions[slot] != version or (
+            max_age is not None and time.time() - stored_at > max_age
+        ):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return values, stored_at
+
+    def put(self, key: str, values: Tuple[float, ...]) -> None:
+        h = stable_hash(key)
+        slot = h % self.capacity
+        start = slot * self.width
+
+        with self._segment.lock():
+            self._versions[slot] += 1  # odd: write in progress
+            self._keys[slot] = h
+            self._stored_at[slot] = time.time()
+            for i, value in enumerate(values):
+                self._values[start + i] = float(value)
+            self._versions[slot] += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def shared_path(name: str) -> Optional[str]:
+    """
+    File backing a shared structure, None when sharing is disabled
+    (single worker: plain private memory)
+    """
+
+    if not settings.shared_state_enabled:
+        return None
+
+    directory = settings.shared_state_dir
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{settings.shared_state_prefix}_{name}")
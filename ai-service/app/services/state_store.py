@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Union
+
+
+class StatefulComponent(Protocol):
+    """
+    Anything that can be snapshotted and restored
+
+    get_state runs on the event loop. Large components return a callable
+    instead: get_state copies what it needs, and the callable builds the
+    dict from those copies in a worker thread.
+    """
+
+    def get_state(self) -> Union[dict, Callable[[], dict]]:
+        ...
+
+    def load_state(self, state: dict) -> None:
+        ...
+
+
+class StateStore(Protocol):
+    """Local state persistence backend"""
+
+    def save(self, snapshots: Dict[str, dict]) -> None:
+        ...
+
+    def load(self) -> Dict[str, dict]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class SQLiteStateStore:
+    """Keep the latest snapshot of each component in a SQLite table"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Snapshots are written from a worker thread
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "name TEXT PRIMARY KEY, data TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def save(self, snapshots: Dict[str, dict]) -> None:
+        conn = self._connect()
+        now = time.time()
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (name, data, saved_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (name, json.dumps(state), now)
+                    for name, state in snapshots.items()
+                ],
+            )
+
+    def load(self) -> Dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+
+        rows = self._connect().execute("SELECT name, data FROM snapshots")
+        return {name: json.loads(data) for name, data in rows}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class FileStateStore:
+    """One JSON snapshot file per component, replaced atomically"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def save(self, snapshots: Dict[str, dict]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        for name, state in snapshots.items():
+            path = self._path(name)
+            tmp_path = path + ".tmp"
+
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+
+            # A crash mid-write never leaves a truncated snapshot behind
+            os.replace(tmp_path, path)
+
+    def load(self) -> Dict[str, dict]:
+        if not os.path.isdir(self.directory):
+            return {}
+
+        snapshots = {}
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    snapshots[filename[:-len(".json")]] = json.load(f)
+            except (OSError, ValueError):
+                continue  # Skip unreadable snapshot, component starts cold
+
+        return snapshots
+
+    def close(self) -> None:
+        pass  # Nothing held open between saves
+
+
+def create_state_store(backend: str, path: str) -> Optional[StateStore]:
+    """Build the configured state store (None disables persistence)"""
+
+    if backend == "sqlite":
+        return SQLiteStateStore(path)
+    if backend == "file":
+        return FileStateStore(path)
+    if backend == "none":
+        return None
+
+    raise ValueError(f"Unknown state store backend: {backend}")
+
+
+class StateManager:
+    """
+    Periodically snapshot registered components and restore them on startup
+    So a restart doesn't mean empty stats, caches and trends
+    """
+
+    def __init__(self):
+        self.store: Optional[StateStore] = None
+        self._components: Dict[str, StatefulComponent] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._saving: Optional[asyncio.Task] = None  # write running in a thread
+        self.last_snapshot_at: Optional[float] = None
+
+    def register(self, name: str, component: StatefulComponent) -> None:
+        """Register a component under a stable snapshot name"""
+        self._components[name] = component
+
+    def open(self, store: Optional[StateStore]) -> None:
+        self.store = store
+
+    def restore(self) -> List[str]:
+        """Restore every registered component that has a snapshot"""
+
+        if self.store is None:
+            return []
+
+        try:
+            snapshots = self.store.load()
+        except Exception as e:
+            print(f"⚠️  Could not load state snapshots: {e}")
+            return []
+
+        restored = []
+        for name, component in self._components.items():
+            if name not in snapshots:
+                continue
+
+            try:
+                component.load_state(snapshots[name])
+                restored.append(name)
+            except Exception as e:
+                print(f"⚠️  Could not restore {name}: {e}")
+
+        return restored
+
+    def collect(self) -> Dict[str, Union[dict, Callable[[], dict]]]:
+        """Take in-memory snapshots (call from the event loop thread)"""
+        return {
+            name: component.get_state()
+            for name, component in self._components.items()
+        }
+
+    def _build_and_save(self, snapshots: Dict[str, Union[dict, Callable[[], dict]]]) -> None:
+        self.store.save({
+            name: state() if callable(state) else state
+            for name, state in snapshots.items()
+        })
+
+    async def snapshot(self) -> None:
+        """
+        Collect snapshots on the event loop, then build deferred ones and
+        write them in a thread, so the loop only pays for the copies
+        """
+
+        if self.store is None:
+            return
+
+        snapshots = self.collect()
+
+        # Shielded: cancelling the caller doesn't stop the thread, so stop()
+        # waits for this write before its final one
+        self._saving = asyncio.create_task(asyncio.to_thread(self._build_and_save, snapshots))
+        await asyncio.shield(self._saving)
+        self.last_snapshot_at = time.time()
+
+    async def _run_periodic(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"⚠️  State snapshot failed: {e}")
+
+    def start(self, interval: float) -> None:
+        """Start the periodic snapshot task"""
+
+        if self.store is not None and self._task is None:
+            self._task = asyncio.create_task(self._run_periodic(interval))
+
+    async def stop(self) -> None:
+        """Stop snapshotting, write a final snapshot and close the store"""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._saving is not None:
+            try:
+                await self._saving
+            except Exception:
+                pass  # Already reported by the periodic task, or superseded below
+            self._saving = None
+
+        if self.store is not None:
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"⚠️  Final state snapshot failed: {e}")
+            self.store.close()
+            self.store = None
+
+
+# Singleton instance
+state_manager = StateManager()
@@ -1,8 +1,10 @@
 from typing import List, Dict
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime
 from app.schemas.tweet import Tweet, TrendingTopic
+from app.schemas.columnar import TweetColumns
 from app.models.buzzer_detector import buzzer_detector
+from app.services.link_index import link_index
 
 
 class TrendingAnalyzer:
@@ -18,16 +20,30 @@ class TrendingAnalyzer:
         Detect if trends are artificially boosted by buzzers
         """
         
-        # Group tweets by hashtags
-        hashtag_groups = self._group_by_hashtags(tweets)
+        return self.analyze_columns(
+            TweetColumns.from_tweets(tweets),
+            min_cluster_size=min_cluster_size,
+        )
+    
+    def analyze_columns(
+        self, 
+        columns: TweetColumns,
+        min_cluster_size: int = 5
+    ) -> List[TrendingTopic]:
+        """Same as analyze_trends, for a columnar batch"""
         
-        # Analyze each hashtag cluster
+        # Group tweets (row indices) by merged hashtag topics
+        topic_groups = self._group_by_topics(columns)
+        
+        # Analyze each topic cluster
         trending_topics = []
         
-        for hashtag, tweet_group in hashtag_groups.items():
-            if len(tweet_group) < min_cluster_size:
+        for topic, rows in topic_groups.items():
+            if len(rows) < min_cluster_size:
                 continue
             
+            tweet_group = columns.take(rows)
+            
             # Detect buzzers in this cluster
             buzzer_count = self._count_buzzers(tweet_group)
             buzzer_pct = (buzzer_count / len(tweet_group)) * 100
@@ -45,7 +61,7 @@ class TrendingAnalyzer:
             top_hashtags = self._get_top_hashtags(tweet_group, limit=5)
             
             trending_topics.append(TrendingTopic(
-                topic=hashtag,
+                topic=topic,
                 tweet_count=len(tweet_group),
                 buzzer_percentage=round(buzzer_pct, 2),
                 top_hashtags=top_hashtags,
@@ -58,74 +74,45 @@ class TrendingAnalyzer:
         
         return trending_topics
     
-    def _group_by_hashtags(
+    def _group_by_topics(
         self, 
-        tweets: List[Tweet]
-    ) -> Dict[str, List[Tweet]]:
-        """Group tweets by their primary hashtag"""
-        
-        groups = defaultdict(list)
+        tweets: TweetColumns
+    ) -> Dict[str, List[int]]:
+        """
+        Group tweet rows by topic: hashtags that strongly co-occur are
+        merged, so campaigns rotating their hashtags form one cluster
+        """
         
-        for tweet in tweets:
-            if tweet.entities.hashtags:
-                # Use first hashtag as primary
-                primary = tweet.entities.hashtags[0]
-                groups[primary].append(tweet)
+        # scipy loads on first use, not at service import
+        from app.models.topic_clustering import TopicClusterer
         
-        return dict(groups)
+        return TopicClusterer().cluster(tweets.hashtags)
     
-    def _count_buzzers(self, tweets: List[Tweet]) -> int:
+    def _count_buzzers(self, tweets: TweetColumns) -> int:
         """Count how many tweets are from buzzers"""
         
-        buzzer_count = 0
-        
-        for tweet in tweets:
-            result = buzzer_detector.detect(tweet)
-            if result.is_buzzer:
-                buzzer_count += 1
-        
-        return buzzer_count
+        # Only the verdict is needed here
+        result = buzzer_detector.detect_columns(
+            tweets,
+            explain=False,
+            link_burst=link_index.burst,
+        )
+        return sum(result['is_buzzer'])
     
-    def _analyze_sentiment(self, tweets: List[Tweet]) -> str:
+    def _analyze_sentiment(self, tweets: TweetColumns) -> str:
         """
-        Simple sentiment analysis based on keywords
+        Lexicon sentiment of the whole cluster (one sparse matrix product)
         (In production, use proper NLP model)
         """
         
-        positive_words = [
-            'bagus', 'hebat', 'sukses', 'berhasil', 'mantap', 
-            'luar biasa', 'positif', 'setuju', 'mendukung'
-        ]
-        
-        negative_words = [
-            'gagal', 'buruk', 'salah', 'korupsi', 'hoax',
-            'bohong', 'negatif', 'tolak', 'menolak', 'protes'
-        ]
+        # scikit-learn/scipy load on first use, not at service import
+        from app.models.sentiment import get_sentiment_scorer
         
-        positive_count = 0
-        negative_count = 0
-        
-        for tweet in tweets:
-            text_lower = tweet.text.lower()
-            
-            for word in positive_words:
-                if word in text_lower:
-                    positive_count += 1
-            
-            for word in negative_words:
-                if word in text_lower:
-                    negative_count += 1
-        
-        if positive_count > negative_count * 1.5:
-            return 'positive'
-        elif negative_count > positive_count * 1.5:
-            return 'negative'
-        else:
-            return 'neutral'
+        return get_sentiment_scorer().classify(tweets.texts)
     
     def _calculate_suspicious_score(
         self, 
-        tweets: List[Tweet],
+        tweets: TweetColumns,
         buzzer_percentage: float
     ) -> float:
         """
@@ -139,7 +126,7 @@ class TrendingAnalyzer:
         score += min(buzzer_percentage / 100, 0.5)
         
         # Factor 2: Account diversity (0-0.25 score)
-        unique_authors = len(set(t.author.username for t in tweets))
+        unique_authors = len(set(tweets.usernames))
         diversity = unique_authors / len(tweets)
         score += (1 - diversity) * 0.25  # Low diversity = suspicious
         
@@ -149,7 +136,7 @@ class TrendingAnalyzer:
         
         return min(score, 1.0)
     
-    def _calculate_time_clustering(self, tweets: List[Tweet]) -> float:
+    def _calculate_time_clustering(self, tweets: TweetColumns) -> float:
         """
         Measure if tweets are suspiciously clustered in time
         (Coordinated buzzer activity)
@@ -160,8 +147,8 @@ class TrendingAnalyzer:
         
         try:
             timestamps = [
-                datetime.fromisoformat(t.created_at.replace('Z', '+00:00'))
-                for t in tweets
+                datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                for created_at in tweets.created_at
             ]
             timestamps.sort()
             
@@ -182,14 +169,14 @@ class TrendingAnalyzer:
     
     def _get_top_hashtags(
         self, 
-        tweets: List[Tweet], 
+        tweets: TweetColumns, 
         limit: int = 5
     ) -> List[str]:
         """Get most common hashtags in tweet cluster"""
         
         all_hashtags = []
-        for tweet in tweets:
-            all_hashtags.extend(tweet.entities.hashtags)
+        for hashtags in tweets.hashtags:
+            all_hashtags.extend(hashtags)
         
         counter = Counter(all_hashtags)
         return [tag for tag, _ in counter.most_common(limit)]
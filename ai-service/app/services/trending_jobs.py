@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Union
+
+from app.schemas.tweet import (
+    Tweet,
+    TrendingJobResponse,
+    TrendingTopicsResponse,
+)
+from app.schemas.columnar import TweetColumns
+from app.services.trending import trending_analyzer
+from app.config import settings
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many trending jobs are already pending"""
+
+
+class TrendingJob:
+    """A single trending analysis job and its outcome"""
+
+    def __init__(self, key: str, tweets: Union[List[Tweet], TweetColumns], min_cluster_size: int):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.tweets: Optional[Union[List[Tweet], TweetColumns]] = tweets
+        self.min_cluster_size = min_cluster_size
+        self.status = "queued"  # queued, running, completed, failed
+        self.result: Optional[TrendingTopicsResponse] = None
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.utcnow().isoformat() + 'Z'
+        self.completed_at: Optional[str] = None
+        self.finished_at: Optional[float] = None  # monotonic, for TTL
+        self.done = asyncio.Event()
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_response(self) -> TrendingJobResponse:
+        return TrendingJobResponse(
+            job_id=self.id,
+            status=self.status,
+            submitted_at=self.submitted_at,
+            completed_at=self.completed_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class TrendingJobManager:
+    """
+    Run trending analyses in a bounded background worker pool
+    Identical submissions share one job; results are kept for a TTL
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, TrendingJob] = {}
+        self._jobs_by_key: Dict[str, TrendingJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.trending_job_workers,
+                thread_name_prefix="trending-job",
+            )
+        return self._executor
+
+    def _request_key(self, body: bytes) -> str:
+        """
+        Fingerprint of a raw request body, used to deduplicate submissions
+        (re-serializing the parsed request would cost more than the hash)
+        """
+        return hashlib.sha256(body).hexdigest()
+
+    def _evict_expired(self) -> None:
+        """Drop finished jobs older than the cache TTL"""
+
+        cutoff = time.monotonic() - settings.cache_ttl_seconds
+        expired = [
+            job for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+
+        for job in expired:
+            del self._jobs[job.id]
+            if self._jobs_by_key.get(job.key) is job:
+                del self._jobs_by_key[job.key]
+
+    def submit(
+        self,
+        tweets: Union[List[Tweet], TweetColumns],
+        min_cluster_size: int,
+        body: bytes
+    ) -> TrendingJob:
+        """
+        Submit a trending analysis of tweets (JSON) or columns (msgpack)
+        body is the raw request they were parsed from
+        Returns the existing job for an identical in-flight or cached request
+        """
+
+        self._evict_expired()
+
+        key = self._request_key(body)
+        existing = self._jobs_by_key.get(key)
+        if existing is not None and existing.status != "failed":
+            return existing
+
+        pending = sum(1 for job in self._jobs.values() if job.is_pending)
+        if pending >= settings.trending_job_max_pending:
+            raise JobQueueFullError(
+                f"Too many pending trending jobs ({pending})"
+            )
+
+        job = TrendingJob(key, tweets, min_cluster_size)
+        self._jobs[job.id] = job
+        self._jobs_by_key[key] = job
+
+        # Keep a reference so the task isn't garbage collected mid-run
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[TrendingJob]:
+        self._evict_expired()
+        return self._jobs.get(job_id)
+
+    def _analyze(self, job: TrendingJob) -> TrendingTopicsResponse:
+        """Runs in a worker thread"""
+
+        job.status = "running"
+
+        # Converting JSON tweets to columns happens here too, off the loop
+        if isinstance(job.tweets, TweetColumns):
+            topics = trending_analyzer.analyze_columns(
+                job.tweets,
+                min_cluster_size=job.min_cluster_size,
+            )
+        else:
+            topics = trending_analyzer.analyze_trends(
+                tweets=job.tweets,
+                min_cluster_size=job.min_cluster_size,
+            )
+
+        return TrendingTopicsResponse(
+            topics=topics,
+            analyzed_count=len(job.tweets),
+            timestamp=datetime.utcnow().isoformat() + 'Z',
+        )
+
+    async def _run(self, job: TrendingJob) -> None:
+        loop = asyncio.get_running_loop()
+
+        try:
+            job.result = await loop.run_in_executor(
+                self._get_executor(), self._analyze, job
+            )
+            job.status = "completed"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.tweets = None  # Don't hold the tweets for the TTL
+            job.completed_at = datetime.utcnow().isoformat() + 'Z'
+            job.finished_at = time.monotonic()
+            job.done.set()
+
+    def get_stats(self) -> dict:
+        self._evict_expired()
+
+        return {
+            'jobs_cached': len(self._jobs),
+            'jobs_pending': sum(1 for job in self._jobs.values() if job.is_pending),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+trending_job_manager = TrendingJobManager()
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from typing import Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from app.schemas.tweet import BuzzerDetectionRequest, BatchDetectionRequest
+from app.services.detection import detection_service
+from app.config import settings
+
+
+class DetectionChannel:
+    """
+    One long-lived WebSocket detection connection
+
+    Protocol (JSON text frames):
+      server -> {"type": "hello", "credits": N}
+      client -> {"type": "detect", "id": "...", "tweet": {...}, "explain": true}
+      client -> {"type": "batch", "id": "...", "tweets": [...], "explain": false}
+      server -> {"type": "result", "id": "...", "result": {...}, "credits": k}
+      server -> {"type": "batch_result", "id": "...", "results": [...], ...}
+      server -> {"type": "error", "id": "...", "error": "...", "credits": k}
+
+    Every tweet costs one credit; credits come back with its result, once
+    that is written to the socket. Results may arrive out of order, matched
+    by "id". Messages sent without enough credits (or invalid) are rejected,
+    and after ws_max_rejected rejections in a row the connection is closed
+    (1008), so a fast producer can't queue unbounded work or error replies.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.credits = settings.ws_credit_window
+        self.rejected = 0  # consecutive rejected messages
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        await self.websocket.accept()
+        await self.websocket.send_json({"type": "hello", "credits": self.credits})
+
+        writer = asyncio.create_task(self._write_loop())
+        try:
+            await self._read_loop()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            writer.cancel()
+
+    async def _read_loop(self) -> None:
+        while True:
+            frame = await self.websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            raw = frame.get("text")
+            if raw is None:
+                await self._reject(None, "Expected a text frame")
+                continue
+
+            try:
+                message = json.loads(raw)
+                if not isinstance(message, dict):
+                    raise ValueError("Message must be a JSON object")
+            except ValueError as e:
+                await self._reject(None, str(e))
+                continue
+
+            correlation_id = message.get("id")
+            kind = message.get("type")
+
+            try:
+                if kind == "detect":
+                    request = BuzzerDetectionRequest.model_validate(message)
+                    cost = 1
+                elif kind == "batch":
+                    request = BatchDetectionRequest.model_validate(message)
+                    cost = len(request.tweets)
+                    if not 0 < cost <= 100:
+                        raise ValueError("Batch must have 1-100 tweets")
+                else:
+                    raise ValueError(f"Unknown message type: {kind}")
+            except (ValidationError, ValueError) as e:
+                await self._reject(correlation_id, str(e))
+                continue
+
+            if cost > self.credits:
+                await self._reject(
+                    correlation_id,
+                    f"Not enough credits ({self.credits} left, {cost} needed)",
+                )
+                continue
+
+            self.rejected = 0
+            self.credits -= cost
+            task = asyncio.create_task(self._process(kind, correlation_id, request, cost))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, kind: str, correlation_id: Optional[str], request, cost: int) -> None:
+        try:
+            if kind == "detect":
+                result = await detection_service.detect_single(
+                    request.tweet,
+                    explain=request.explain,
+                )
+                message = {"type": "result", "id": correlation_id, "result": result.model_dump()}
+            else:
+                result = await detection_service.detect_batch(
+                    tweets=request.tweets,
+                    threshold=request.threshold,
+                    explain=request.explain,
+                )
+                message = {"type": "batch_result", "id": correlation_id, **result.model_dump()}
+        except Exception as e:
+            message = {"type": "error", "id": correlation_id, "error": str(e)}
+
+        # Work is done: the writer hands the credits back with the answer
+        message["credits"] = cost
+        self._send(message)
+
+    async def _reject(self, correlation_id: Optional[str], error: str) -> None:
+        """Answer a rejected message, closing the connection after too many in a row"""
+
+        self.rejected += 1
+        if self.rejected > settings.ws_max_rejected:
+            await self.websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="Too many rejected messages",
+            )
+            raise WebSocketDisconnect(status.WS_1008_POLICY_VIOLATION)
+
+        self._send({"type": "error", "id": correlation_id, "error": error, "credits": 0})
+
+    def _send(self, message: dict) -> None:
+        self._outbox.put_nowait(message)
+
+    async def _write_loop(self) -> None:
+        """Single writer, so concurrent results never interleave frames"""
+        while True:
+            message = await self._outbox.get()
+            try:
+                await self.websocket.send_json(message)
+            except (WebSocketDisconnect, RuntimeError):
+                return  # Client went away; the read loop cleans up
+
+            # Credits return only once the result is out, so results
+            # waiting on a slow reader still count against the window
+            self.credits += message["credits"]
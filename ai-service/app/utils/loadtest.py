@@ -0,0 +1,515 @@
+"""
+Replay-driven load test for the AI service
+
+Replays recorded or synthetic tweets at a target rate against the FastAPI
+app (in-process by default, or --url for a running server) with a mix of
+/api/detect, /api/detect/batch and /api/trending, the way the Node backend
+calls it: one POST /api/detect per scraped tweet with a 5s timeout.
+
+In-process, the generator and the app share one event loop, so latencies
+are harness + app combined. --find-saturation without --url therefore
+starts the app in its own uvicorn process.
+
+    python -m app.utils.loadtest --rate 50 --duration 10
+    python -m app.utils.loadtest --find-saturation --slo-p99-ms 200
+    python -m app.utils.loadtest --replay tweets.jsonl --mix detect=0.7,batch=0.2,trending=0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+
+# Mirrors backend/src/services/mock-data.service.ts
+TOPICS = [
+    (['SubsidiBBM', 'PolitikIndonesia', 'APBN2024'], ['subsidi', 'BBM', 'pemerintah', 'kebijakan']),
+    (['PemilihanPresiden', 'Pilpres2024', 'Demokrasi'], ['calon', 'presiden', 'pemilu', 'koalisi']),
+    (['IKN', 'NusantaraBaru', 'PindahIbukota'], ['ibu kota', 'Nusantara', 'Kalimantan', 'pembangunan']),
+    (['UUCipta Kerja', 'OmnibusLaw', 'BuruhIndonesia'], ['buruh', 'upah', 'PHK', 'demonstrasi']),
+    (['KorupsiIndonesia', 'KPK', 'AntiKorupsi'], ['korupsi', 'KPK', 'gratifikasi', 'penyidikan']),
+]
+BUZZER_USERNAMES = ['politikupdate_', 'rakyatbicara_', 'faktaindonesia_', 'suaranetizen_', 'infoakurat_']
+BUZZER_PHRASES = ['BREAKING: ', 'URGENT: ', 'VIRAL: ', 'THREAD 🧵: ', 'Ini yang perlu kalian tahu: ']
+BUZZER_EMOJIS = ['🔥', '⚠️', '🚨', '📢', '‼️', '✅', '❌']
+BUZZER_TEMPLATES = [
+    '{prefix}Kebijakan baru tentang {keyword} akan segera diumumkan! {emoji}',
+    '{prefix}Pemerintah berhasil {keyword} dengan hasil luar biasa! {emoji}',
+    'WAJIB TAHU! Ini fakta sebenarnya tentang {keyword} {emoji}',
+    'Jangan percaya hoax! Ini data resmi tentang {keyword} {emoji}',
+]
+NORMAL_TEMPLATES = [
+    'Menurut saya kebijakan {keyword} ini perlu dikaji lebih dalam lagi.',
+    'Gimana pendapat kalian tentang {keyword}? Apa dampaknya ke kita?',
+    'Baru baca berita tentang {keyword}, semoga ada solusi terbaiknya.',
+    'Sebagai warga negara, kita harus kritis terhadap {keyword}.',
+]
+NORMAL_USERS = [
+    ('budi_jakarta', 'Budi Santoso', 450, 320),
+    ('siti_bandung', 'Siti Nurhaliza', 1200, 890),
+    ('agus_pemuda', 'Agus Wijaya', 350, 420),
+    ('rina_mahasiswa', 'Rina Kartika', 680, 550),
+    ('joko_entrepreneur', 'Joko Susilo', 2300, 1100),
+]
+
+# Same timeout as CONFIG.ai.timeout in the backend
+BACKEND_TIMEOUT_SECONDS = 5.0
+
+# Statuses that mean the service shed load rather than failed
+SHED_STATUSES = (429, 503)
+
+
+def synthetic_tweets(buzzer_rate: float = 0.3, seed: int = 42) -> Iterator[dict]:
+    """Endless stream of mock tweets, same distributions as the backend's generator"""
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    def random_id() -> str:
+        return '%012x' % rng.getrandbits(48)
+
+    def recent_date(days_ago: int) -> str:
+        return (now - timedelta(days=rng.randint(0, days_ago))).isoformat() + 'Z'
+
+    buzzers = []
+    for i in range(20):
+        username = BUZZER_USERNAMES[i % len(BUZZER_USERNAMES)] + random_id()
+        buzzers.append({
+            'id': random_id(),
+            'username': username,
+            'display_name': username.replace('_', ' ', 1).upper(),
+            'followers': rng.randint(800, 2000),
+            'following': rng.randint(1800, 3500),
+            'verified': False,
+            'created_at': recent_date(90),
+        })
+
+    counter = 0
+    while True:
+        counter += 1
+        hashtags, keywords = rng.choice(TOPICS)
+        is_buzzer = rng.random() < buzzer_rate
+        keyword = rng.choice(keywords)
+
+        if is_buzzer:
+            author = rng.choice(buzzers)
+            text = rng.choice(BUZZER_TEMPLATES).format(
+                prefix=rng.choice(BUZZER_PHRASES),
+                keyword=keyword,
+                emoji=rng.choice(BUZZER_EMOJIS),
+            )
+            tags = hashtags[:rng.randint(3, min(5, len(hashtags)))]
+        else:
+            username, name, followers, following = rng.choice(NORMAL_USERS)
+            author = {
+                'id': random_id(),
+                'username': username,
+                'display_name': name,
+                'followers': followers,
+                'following': following,
+                'verified': rng.random() > 0.9,
+                'created_at': recent_date(365 * 3),
+            }
+            text = rng.choice(NORMAL_TEMPLATES).format(keyword=keyword)
+            tags = hashtags[:rng.randint(1, 2)]
+
+        yield {
+            'id': f'load-{counter}',
+            'text': text + ' ' + ' '.join('#' + tag for tag in tags),
+            'author': author,
+            'created_at': now.isoformat() + 'Z',
+            'metrics': {
+                'likes': rng.randint(10, 150) if is_buzzer else rng.randint(1, 50),
+                'retweets': rng.randint(20, 300) if is_buzzer else rng.randint(2, 80),
+                'replies': rng.randint(0, 50 if is_buzzer else 20),
+                'views': rng.randint(500, 5000) if is_buzzer else rng.randint(100, 1000),
+            },
+            'entities': {
+                'hashtags': tags,
+                'mentions': [],
+                'urls': ['https://example.com/article'] if rng.random() > 0.7 else [],
+            },
+        }
+
+
+def replay_tweets(path: str) -> Iterator[dict]:
+    """
+    Loop over recorded tweets, one JSON object per line
+    (either a tweet or a {"tweet": ...} detect request body)
+    """
+
+    with open(path, encoding='utf-8') as f:
+        tweets = [json.loads(line) for line in f if line.strip()]
+
+    tweets = [t.get('tweet', t) for t in tweets]
+    if not tweets:
+        raise ValueError(f"No tweets in {path}")
+
+    while True:
+        yield from tweets
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'detect=0.8,batch=0.15,trending=0.05' -> normalized weights"""
+
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('detect', 'batch', 'trending'):
+            raise ValueError(f"Unknown request kind: {name}")
+        mix[name] = float(weight)
+
+    total = sum(mix.values())
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class StepResult:
+    """Outcome of running one target rate for a fixed duration"""
+
+    def __init__(self, rate: float, duration: float):
+        self.rate = rate
+        self.duration = duration
+        self.elapsed = 0.0  # until the last response, set by LoadRunner.run
+        self.latencies_ms: Dict[str, List[float]] = defaultdict(list)
+        self.ok = 0
+        self.errors = 0
+        self.shed = 0      # server answered 429/503
+        self.dropped = 0   # client in-flight limit reached, never sent
+        self.sent = 0
+
+    @property
+    def throughput(self) -> float:
+        seconds = self.elapsed or self.duration
+        return self.ok / seconds if seconds else 0.0
+
+    def _rate_of(self, count: int) -> float:
+        attempted = self.sent + self.dropped
+        return count / attempted if attempted else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self._rate_of(self.errors)
+
+    @property
+    def shed_rate(self) -> float:
+        return self._rate_of(self.shed + self.dropped)
+
+    def all_latencies(self) -> List[float]:
+        return sorted(ms for values in self.latencies_ms.values() for ms in values)
+
+    def p99(self) -> float:
+        return percentile(self.all_latencies(), 99)
+
+    def summary(self) -> dict:
+        def stats(values: List[float]) -> dict:
+            values = sorted(values)
+            return {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50), 2),
+                'p95_ms': round(percentile(values, 95), 2),
+                'p99_ms': round(percentile(values, 99), 2),
+            }
+
+        return {
+            'target_rate': self.rate,
+            'throughput_rps': round(self.throughput, 1),
+            'sent': self.sent,
+            'ok': self.ok,
+            'error_rate': round(self.error_rate, 4),
+            'shed_rate': round(self.shed_rate, 4),
+            **stats(self.all_latencies()),
+            'by_endpoint': {
+                kind: stats(values)
+                for kind, values in self.latencies_ms.items()
+            },
+        }
+
+
+class LoadRunner:
+    """Open-loop load generator (arrivals don't wait for responses)"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        tweets: Iterator[dict],
+        mix: Dict[str, float],
+        batch_size: int = 50,
+        trending_size: int = 200,
+        max_in_flight: int = 500,
+        seed: int = 7,
+    ):
+        self.client = client
+        self.tweets = tweets
+        self.mix = mix
+        self.batch_size = batch_size
+        self.trending_size = trending_size
+        self.max_in_flight = max_in_flight
+        self.rng = random.Random(seed)
+        self.in_flight = 0
+
+    def _take(self, count: int) -> List[dict]:
+        return [next(self.tweets) for _ in range(count)]
+
+    def _next_request(self):
+        kind = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+
+        if kind == 'detect':
+            # Backend's callAIService: one tweet per POST
+            return kind, '/api/detect', {'tweet': next(self.tweets)}
+        if kind == 'batch':
+            return kind, '/api/detect/batch', {'tweets': self._take(self.batch_size)}
+        return kind, '/api/trending', {'tweets': self._take(self.trending_size)}
+
+    async def _send(self, result: StepResult, kind: str, path: str, body: dict, scheduled: float):
+        """Send one request; the caller has already reserved its in-flight slot"""
+
+        try:
+            # ASGITransport ignores httpx timeouts, so enforce it here
+            response = await asyncio.wait_for(
+                self.client.post(path, json=body, timeout=BACKEND_TIMEOUT_SECONDS),
+                BACKEND_TIMEOUT_SECONDS,
+            )
+            # Measured from the scheduled send time, so client-side queueing counts
+            latency_ms = (time.perf_counter() - scheduled) * 1000
+
+            if response.status_code in SHED_STATUSES:
+                result.shed += 1
+            elif response.is_success:
+                result.ok += 1
+                result.latencies_ms[kind].append(latency_ms)
+            else:
+                result.errors += 1
+        except Exception:
+            result.errors += 1  # timeouts included, like the backend's fallback
+        finally:
+            self.in_flight -= 1
+
+    async def run(self, rate: float, duration: float) -> StepResult:
+        """Send `rate` requests per second for `duration` seconds"""
+
+        result = StepResult(rate, duration)
+        interval = 1.0 / rate
+        start = time.perf_counter()
+        tasks = []
+
+        for i in range(int(rate * duration)):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self.in_flight >= self.max_in_flight:
+                result.dropped += 1
+                continue
+
+            kind, path, body = self._next_request()
+            result.sent += 1
+            # Reserve before the task runs: behind schedule, the loop above
+            # creates tasks without yielding
+            self.in_flight += 1
+            tasks.append(asyncio.create_task(self._send(result, kind, path, body, scheduled)))
+
+        await asyncio.gather(*tasks)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def within_slo(result: StepResult, slo_p99_ms: float, max_error_rate: float) -> bool:
+    """A rate is sustainable if latency, failures and throughput all hold"""
+    return (
+        result.p99() <= slo_p99_ms
+        and result.error_rate + result.shed_rate <= max_error_rate
+        and result.throughput >= 0.9 * result.rate
+    )
+
+
+async def find_saturation(
+    runner: LoadRunner,
+    start_rate: float,
+    duration: float,
+    slo_p99_ms: float,
+    max_error_rate: float,
+    max_rate: float = 10000,
+    growth: float = 1.5,
+    refine_steps: int = 3,
+) -> dict:
+    """
+    Ramp the rate geometrically until the SLO breaks, then bisect
+    between the last good and first bad rate
+    """
+
+    steps = []
+    good: Optional[float] = None
+    bad: Optional[float] = None
+    rate = start_rate
+
+    while rate <= max_rate:
+        result = await runner.run(rate, duration)
+        steps.append(result.summary())
+        print(_format_step(result))
+
+        if within_slo(result, slo_p99_ms, max_error_rate):
+            good = rate
+            rate *= growth
+        else:
+            bad = rate
+            break
+
+    if good is not None and bad is not None:
+        for _ in range(refine_steps):
+            rate = (good + bad) / 2
+            result = await runner.run(rate, duration)
+            steps.append(result.summary())
+            print(_format_step(result))
+
+            if within_slo(result, slo_p99_ms, max_error_rate):
+                good = rate
+            else:
+                bad = rate
+
+    return {
+        'saturation_rps': round(good, 1) if good is not None else None,
+        'first_failing_rps': round(bad, 1) if bad is not None else None,
+        'slo_p99_ms': slo_p99_ms,
+        'max_error_rate': max_error_rate,
+        'steps': steps,
+    }
+
+
+def _format_step(result: StepResult) -> str:
+    s = result.summary()
+    return (
+        f"rate {s['target_rate']:>8.1f}/s  thru {s['throughput_rps']:>8.1f}/s  "
+        f"p50 {s['p50_ms']:>7.1f}  p95 {s['p95_ms']:>7.1f}  p99 {s['p99_ms']:>7.1f} ms  "
+        f"err {s['error_rate']:.2%}  shed {s['shed_rate']:.2%}"
+    )
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get('/health')).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Service did not become ready")
+
+
+def _spawn_server() -> Tuple[subprocess.Popen, str]:
+    """Run the app in its own uvicorn process on a free local port"""
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    env = {**os.environ, 'STATE_STORE_BACKEND': os.environ.get('STATE_STORE_BACKEND', 'none')}
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1',
+         '--port', str(port), '--log-level', 'warning'],
+        env=env,
+    )
+    return process, f'http://127.0.0.1:{port}'
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    tweets = replay_tweets(args.replay) if args.replay else synthetic_tweets(seed=args.seed)
+
+    async def drive(client: httpx.AsyncClient) -> dict:
+        await _wait_until_ready(client)
+        runner = LoadRunner(
+            client,
+            tweets,
+            parse_mix(args.mix),
+            batch_size=args.batch_size,
+            trending_size=args.trending_size,
+            max_in_flight=args.max_in_flight,
+            seed=args.seed,
+        )
+
+        if args.find_saturation:
+            return await find_saturation(
+                runner,
+                start_rate=args.rate,
+                duration=args.duration,
+                slo_p99_ms=args.slo_p99_ms,
+                max_error_rate=args.max_error_rate,
+            )
+
+        result = await runner.run(args.rate, args.duration)
+        print(_format_step(result))
+        return result.summary()
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            return await drive(client)
+
+    if args.find_saturation:
+        # Keep client scheduling lag out of the latencies the SLO is judged on
+        process, url = _spawn_server()
+        try:
+            async with httpx.AsyncClient(base_url=url) as client:
+                return await drive(client)
+        finally:
+            process.terminate()
+            process.wait()
+
+    # In-process stand-in: don't let load-test traffic touch persisted state
+    os.environ.setdefault('STATE_STORE_BACKEND', 'none')
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://ai-service') as client:
+            return await drive(client)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='Running service base URL (default: in-process app)')
+    parser.add_argument('--replay', help='JSONL file of recorded tweets (default: synthetic)')
+    parser.add_argument('--mix', default='detect=0.9,batch=0.08,trending=0.02')
+    parser.add_argument('--rate', type=float, default=20, help='Requests per second (start rate when searching)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per rate step')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--trending-size', type=int, default=200)
+    parser.add_argument('--max-in-flight', type=int, default=500)
+    parser.add_argument('--find-saturation', action='store_true')
+    parser.add_argument('--slo-p99-ms', type=float, default=100)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write the report to this file')
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+
+    if args.find_saturation:
+        print(f"Saturation point: {report['saturation_rps']} req/s "
+              f"(p99 <= {args.slo_p99_ms} ms, errors+shed <= {args.max_error_rate:.1%})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+import re
+from typing import List
+
+
+# Words only; hashtags/mentions lose their # and @ prefix
+TOKEN_PATTERN = re.compile(r"\w+", flags=re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
@@ -0,0 +1,124 @@
+import os
+import time
+from typing import Dict, Optional
+
+
+def _process_age() -> float:
+    """
+    Seconds since this process was started, per the OS (Linux /proc),
+    so interpreter start and imports before this module are included
+    Falls back to 0 (timings from this module's import) elsewhere
+    """
+
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+# Reference point for startup timings, on the perf_counter clock
+PROCESS_START = time.perf_counter() - _process_age()
+
+
+class StartupProfile:
+    """Record startup phases and time-to-first-detection"""
+
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Record seconds since process start, only the first time"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - PROCESS_START
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations[name] = seconds
+
+    def is_marked(self, name: str) -> bool:
+        return name in self.marks
+
+    def report(self) -> dict:
+        """Timings in milliseconds"""
+        return {
+            'since_start_ms': {
+                name: round(seconds * 1000, 1)
+                for name, seconds in self.marks.items()
+            },
+            'durations_ms': {
+                name: round(seconds * 1000, 1)
+                for name, seconds in self.durations.items()
+            },
+        }
+
+
+def import_time_report(module: str = "app.main", limit: int = 15) -> str:
+    """
+    Import `module` in a fresh interpreter with -X importtime
+    Returns the slowest imports by cumulative time
+    """
+
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module>"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+
+    total: Optional[int] = next(
+        (cumulative for cumulative, _, name in rows if name == module),
+        None,
+    )
+
+    if total is None:
+        return f"Import of {module} failed:\n{proc.stderr[-2000:]}"
+
+    rows.sort(reverse=True)
+    lines = [f"Import of {module}: {total / 1000:.1f} ms"]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, name in rows[:limit]:
+        lines.append(f"{cumulative / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    return "\n".join(lines)
+
+
+# Singleton instance
+startup_profile = StartupProfile()
+
+
+if __name__ == "__main__":
+    # python -m app.utils.profiling
+    import asyncio
+
+    print(import_time_report())
+    print()
+
+    # Fresh import of this module so timings start here, not at report time
+    from app.utils.profiling import startup_profile as profile
+
+    import app.main  # noqa: F401
+    profile.mark("app_imported")
+
+    from app.services.warmup import warmup
+    asyncio.run(warmup())
+
+    for phase, ms in profile.report()['since_start_ms'].items():
+        print(f"{phase:>24}: {ms:.1f} ms since start")
+    for phase, ms in profile.report()['durations_ms'].items():
+        print(f"{phase:>24}: {ms:.1f} ms")
@@ -0,0 +1,81 @@
+import os
+
+# Keep tests off the real state store and shared memory
+os.environ.setdefault("STATE_STORE_BACKEND", "none")
+os.environ.setdefault("SHARED_STATE_ENABLED", "false")
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas.tweet import Tweet
+
+
+def build_tweet(
+    id: str = "1",
+    text: str = "halo",
+    author_id: str = "a1",
+    followers: int = 100,
+    following: int = 50,
+    verified: bool = False,
+    account_age_days: int = 400,
+    likes: int = 1,
+    retweets: int = 0,
+    replies: int = 0,
+    views: int = 100,
+    hashtags=(),
+    mentions=(),
+    urls=(),
+) -> Tweet:
+    created = (datetime.utcnow() - timedelta(days=account_age_days)).isoformat() + "Z"
+    return Tweet(
+        id=id,
+        text=text,
+        author=dict(
+            id=author_id,
+            username=f"user{author_id}",
+            display_name=f"User {author_id}",
+            followers=followers,
+            following=following,
+            verified=verified,
+            created_at=created,
+        ),
+        created_at=datetime.utcnow().isoformat() + "Z",
+        metrics=dict(likes=likes, retweets=retweets, replies=replies, views=views),
+        entities=dict(hashtags=list(hashtags), mentions=list(mentions), urls=list(urls)),
+    )
+
+
+@pytest.fixture(scope="session")
+def make_tweet():
+    return build_tweet
+
+
+WORDS = [
+    "BREAKING:", "halo", "VIRAL", "!", "🔥", "kebijakan", "GAGAL",
+    "!!!", "😀😀", "FAKTA SEBENARNYA", "ok", "URGENT:",
+]
+
+
+@pytest.fixture(scope="session")
+def random_tweets():
+    """Tweets spread across every signal, verified or not"""
+
+    rng = random.Random(7)
+    return [
+        build_tweet(
+            id=str(i),
+            text=" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))),
+            author_id=f"a{i % 50}",
+            followers=rng.choice([0, 10, 1000]),
+            following=rng.choice([5, 500]),
+            verified=rng.random() < 0.2,
+            account_age_days=rng.choice([10, 100, 400]),
+            likes=rng.randint(0, 5),
+            retweets=rng.randint(0, 20),
+            views=rng.choice([0, 100]),
+            hashtags=["x"] * rng.randint(0, 6),
+        )
+        for i in range(3000)
+    ]
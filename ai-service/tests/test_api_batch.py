@@ -0,0 +1,70 @@
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.columnar import TweetColumns
+from app.schemas.tweet import BatchDetectionRequest
+
+
+client = TestClient(app)
+
+MSGPACK_HEADERS = {"content-type": "application/x-msgpack"}
+
+
+def columnar_body(tweets, **options) -> bytes:
+    columns = TweetColumns.from_tweets(tweets)
+    data = {name: getattr(columns, name) for name in TweetColumns.FIELDS}
+    return msgpack.packb({**data, **options}, use_bin_type=True)
+
+
+def test_json_validation_errors_match_declared_body():
+    """Errors keep the ("body", ...) locations of a declared body parameter"""
+
+    reference = FastAPI()
+
+    @reference.post("/batch")
+    async def batch(request: BatchDetectionRequest):
+        return {}
+
+    payload = {"tweets": [{"id": "1"}], "threshold": "high"}
+    expected = TestClient(reference).post("/batch", json=payload)
+    response = client.post("/api/detect/batch", json=payload)
+
+    assert response.status_code == expected.status_code == 422
+    locs = [error["loc"] for error in response.json()["detail"]]
+    assert locs == [error["loc"] for error in expected.json()["detail"]]
+    assert all(loc[0] == "body" for loc in locs)
+
+
+def test_msgpack_batch_roundtrip(make_tweet):
+    tweets = [make_tweet(id=str(i)) for i in range(3)]
+
+    response = client.post(
+        "/api/detect/batch",
+        content=columnar_body(tweets, explain=False),
+        headers=MSGPACK_HEADERS,
+    )
+
+    assert response.status_code == 200
+    result = msgpack.unpackb(response.content, raw=False)
+    assert result["tweet_ids"] == ["0", "1", "2"]
+    assert result["reasons"] is None
+
+
+@pytest.mark.parametrize("path, options", [
+    ("/api/detect/batch", {"explain": "false"}),
+    ("/api/detect/batch", {"threshold": "0.5"}),
+    ("/api/trending", {"min_cluster_size": "abc"}),
+    ("/api/trending", {"min_cluster_size": True}),
+])
+def test_msgpack_options_are_validated(make_tweet, path, options):
+    response = client.post(
+        path,
+        content=columnar_body([make_tweet()], **options),
+        headers=MSGPACK_HEADERS,
+    )
+
+    assert response.status_code == 400
+    assert next(iter(options)) in response.json()["detail"]
@@ -0,0 +1,81 @@
+import asyncio
+
+from app.services.author_risk import AuthorRiskStore
+from app.services.state_store import StateManager, create_state_store
+
+
+def test_retried_tweet_counts_once():
+    store = AuthorRiskStore(capacity=8)
+
+    store.update("a1", "t1", True, score=0.8, reason_codes=["is_new_account"])
+    store.update("a1", "t1", True, score=0.8, reason_codes=["is_new_account"])
+    store.update("a1", "t1", True)
+    store.update("a1", "t2", False)
+
+    record = store.get("a1")
+    assert record["tweet_count"] == 2
+    assert record["buzzer_count"] == 1
+    assert record["top_reasons"] == ["is_new_account"]
+
+
+def test_least_recently_seen_author_is_evicted():
+    store = AuthorRiskStore(capacity=2)
+
+    store.update("a1", "t1", False)
+    store.update("a2", "t2", False)
+    store.update("a1", "t3", False)
+    store.update("a3", "t4", False)
+
+    assert store.get("a2") is None
+    assert store.get("a1")["tweet_count"] == 2
+    assert store.get_stats()["evictions"] == 1
+
+
+def test_snapshot_is_a_copy():
+    store = AuthorRiskStore(capacity=8)
+    store.update("a1", "t1", True, score=0.9)
+
+    build = store.get_state()
+    store.update("a1", "t2", True, score=0.5)
+
+    (record,) = build()["records"]
+    assert record[0] == "a1"
+    assert record[2] == 1  # tweet_count as of get_state()
+
+
+def test_snapshot_roundtrip(tmp_path):
+    store = AuthorRiskStore(capacity=8)
+    store.update("a1", "t1", True, score=0.9, reason_codes=["follower_ratio"])
+    store.update("a2", "t2", False)
+
+    manager = StateManager()
+    manager.register("author_risk", store)
+    manager.open(create_state_store("file", str(tmp_path)))
+    asyncio.run(manager.snapshot())
+
+    restored = AuthorRiskStore(capacity=8)
+    manager = StateManager()
+    manager.register("author_risk", restored)
+    manager.open(create_state_store("file", str(tmp_path)))
+
+    assert manager.restore() == ["author_risk"]
+    assert restored.get("a1") == store.get("a1")
+    assert restored.get("a2") == store.get("a2")
+
+
+def test_not_snapshotted_with_shared_state(tmp_path, monkeypatch):
+    from app.config import settings
+    from app.main import app
+    from app.services.state_store import state_manager
+
+    monkeypatch.setattr(settings, "shared_state_enabled", True)
+    monkeypatch.setattr(settings, "state_store_backend", "file")
+    monkeypatch.setattr(settings, "state_store_path", str(tmp_path))
+    monkeypatch.setattr(state_manager, "_components", {})
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            return set(state_manager._components)
+
+    assert "author_risk" not in asyncio.run(run())
+    assert not (tmp_path / "author_risk.json").exists()
@@ -0,0 +1,19 @@
+from app.models.buzzer_detector import buzzer_detector
+from app.schemas.columnar import TweetColumns
+
+
+def test_columnar_matches_per_tweet(random_tweets):
+    columns = TweetColumns.from_tweets(random_tweets)
+    full = buzzer_detector.detect_columns(columns, explain=True)
+    lazy = buzzer_detector.detect_columns(columns, explain=False)
+
+    for i, tweet in enumerate(random_tweets):
+        single = buzzer_detector.detect(tweet)
+        single_lazy = buzzer_detector.detect(tweet, explain=False)
+
+        assert full['is_buzzer'][i] == lazy['is_buzzer'][i] == single.is_buzzer
+        assert full['buzzer_scores'][i] == single.buzzer_score
+        assert full['reasons'][i] == single.reasons
+        assert full['confidences'][i] == single.confidence
+        assert lazy['buzzer_scores'][i] == single_lazy.buzzer_score
+        assert lazy['confidences'][i] == single_lazy.confidence
@@ -0,0 +1,193 @@
+import threading
+
+import pytest
+
+from app.models.buzzer_detector import buzzer_detector
+from app.schemas.columnar import TweetColumns
+from app.services.link_index import LinkIndex, normalize_url
+
+
+T0 = 1_000_000 * 60  # bucket-aligned start time
+URL = "https://promo.example/deal"
+
+
+def share(index, url, authors, now):
+    for author in authors:
+        index.record([url], author, now=now)
+
+
+def test_normalize_url_drops_tracking():
+    assert normalize_url("https://www.Promo.example/deal/?utm_source=x&b=2&a=1#top") == (
+        "promo.example/deal?a=1&b=2",
+        "promo.example",
+    )
+    assert normalize_url("promo.example/deal?fbclid=1") == ("promo.example/deal", "promo.example")
+    assert normalize_url("not a url") is None
+
+
+def test_url_burst_expires_after_window():
+    index = LinkIndex(capacity=16, bucket_seconds=60, window_buckets=5)
+    share(index, URL, [f"a{i}" for i in range(12)], T0)
+
+    assert index.burst([URL], now=T0 + 4 * 60) >= 10
+    assert index.burst([URL], now=T0 + 5 * 60) == 0.0
+
+
+def test_domain_growth_needs_full_history():
+    index = LinkIndex(capacity=64, bucket_seconds=60, window_buckets=5)
+
+    # Cold start: a busy domain with no observed previous window
+    share(index, "https://news.example/a", [f"a{i}" for i in range(30)], T0)
+    assert index.burst(["https://news.example/new-story"], now=T0) == 0.0
+    assert index.lookup("https://news.example/x", now=T0)["domain_authors_previous"] is None
+
+    # Quiet through a full previous window, then a surge
+    index.record(["https://news.example/b"], "steady", now=T0 + 9 * 60)
+    share(index, "https://news.example/c", [f"b{i}" for i in range(30)], T0 + 10 * 60)
+    assert index.burst(["https://news.example/other"], now=T0 + 10 * 60) >= 10
+
+
+def test_steady_domain_does_not_fire():
+    index = LinkIndex(capacity=256, bucket_seconds=60, window_buckets=5)
+    for minute in range(20):
+        share(index, f"https://news.example/{minute}", [f"a{minute % 5}{i}" for i in range(3)],
+              T0 + minute * 60)
+
+    assert index.burst(["https://news.example/fresh"], now=T0 + 19 * 60) < 10
+
+
+def test_evicted_domain_restarts_history():
+    index = LinkIndex(capacity=4, bucket_seconds=60, window_buckets=5)
+    index.record(["https://news.example/a"], "early", now=T0)
+
+    # Two other links (four keys) push the domain out
+    index.record(["https://other.example/1", "https://third.example/1"], "x", now=T0 + 60)
+    assert index.get_stats()["evictions"] > 0
+
+    share(index, "https://news.example/b", [f"a{i}" for i in range(30)], T0 + 10 * 60)
+    assert index.burst(["https://news.example/c"], now=T0 + 10 * 60) == 0.0
+
+
+def test_least_recently_shared_key_is_evicted():
+    index = LinkIndex(capacity=4, bucket_seconds=60, window_buckets=5)
+    index.record(["https://one.example/a"], "x", now=T0)
+    index.record(["https://two.example/a"], "x", now=T0)
+    index.record(["https://three.example/a"], "x", now=T0)
+
+    assert len(index) == 4
+    assert index.lookup("https://one.example/a", now=T0)["url_tweets"] == 0
+    assert index.lookup("https://three.example/a", now=T0)["url_tweets"] == 1
+
+
+def test_snapshot_is_a_copy_and_roundtrips():
+    index = LinkIndex(capacity=16, bucket_seconds=60, window_buckets=5)
+    share(index, URL, [f"a{i}" for i in range(12)], None)
+
+    build = index.get_state()
+    share(index, URL, [f"b{i}" for i in range(12)], None)
+    state = build()
+
+    restored = LinkIndex(capacity=16, bucket_seconds=60, window_buckets=5)
+    restored.load_state(state)
+    assert restored.lookup(URL)["url_tweets"] == 12
+    assert restored.get_state()()["records"] == state["records"]
+
+    # Snapshots with another bucket layout are ignored
+    other = LinkIndex(capacity=16, bucket_seconds=30, window_buckets=5)
+    other.load_state(state)
+    assert len(other) == 0
+
+
+def test_reads_from_another_thread_while_recording():
+    index = LinkIndex(capacity=32, bucket_seconds=60, window_buckets=5)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                index.burst([f"https://site{i % 50}.example/p" for i in range(3)], now=T0)
+        except Exception as e:  # pragma: no cover - only on failure
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(5000):
+            index.record([f"https://site{i % 50}.example/p"], f"a{i}", now=T0 + i % 3 * 60)
+    finally:
+        done.set()
+        reader.join()
+
+    assert errors == []
+
+
+def share_from_worker(path: str, worker: int) -> None:
+    """Worker: its own share of the accounts pushing one link"""
+
+    index = LinkIndex(capacity=64, bucket_seconds=60, window_buckets=5, path=path)
+    share(index, URL, [f"w{worker}-{i}" for i in range(5)], T0)
+
+
+def test_workers_share_one_index(tmp_path):
+    import multiprocessing
+
+    path = str(tmp_path / "links")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(4) as pool:
+        pool.starmap(share_from_worker, [(path, worker) for worker in range(4)])
+
+    # 5 accounts per worker: only the combined stream reaches the threshold
+    index = LinkIndex(capacity=64, bucket_seconds=60, window_buckets=5, path=path)
+    assert index.lookup(URL, now=T0)["url_tweets"] == 20
+    assert index.burst([URL], now=T0) >= 10
+
+    # Every worker restores the same snapshot; only an empty index takes it
+    head = index._bucket(None)
+    index.load_state({"bucket_seconds": 60, "ring": 10, "records": [[1, head, head, [9] * 10, [0] * 10]]})
+    assert len(index) == 2
+
+
+CAMPAIGN_URL = "https://parity-campaign.example/promo"
+
+
+@pytest.fixture(scope="module")
+def campaign():
+    """Random tweets, some pushing a link 40 accounts are sharing right now"""
+
+    index = LinkIndex(capacity=64, bucket_seconds=60, window_buckets=5)
+    share(index, CAMPAIGN_URL, [f"pusher{i}" for i in range(40)], None)
+    return index
+
+
+@pytest.fixture(scope="module")
+def link_tweets(random_tweets):
+    return [
+        tweet.model_copy(update={
+            "entities": tweet.entities.model_copy(update={"urls": [CAMPAIGN_URL]}),
+        }) if i % 5 < 2 else tweet
+        for i, tweet in enumerate(random_tweets[:1000])
+    ]
+
+
+def test_link_burst_scoring_parity(campaign, link_tweets):
+    columns = TweetColumns.from_tweets(link_tweets)
+    full = buzzer_detector.detect_columns(columns, explain=True, link_burst=campaign.burst)
+    lazy = buzzer_detector.detect_columns(columns, explain=False, link_burst=campaign.burst)
+
+    for i, tweet in enumerate(link_tweets):
+        single = buzzer_detector.detect(tweet, link_burst=campaign.burst)
+        single_lazy = buzzer_detector.detect(tweet, explain=False, link_burst=campaign.burst)
+
+        assert single.is_buzzer == single_lazy.is_buzzer == full["is_buzzer"][i] == lazy["is_buzzer"][i]
+        assert full["buzzer_scores"][i] == single.buzzer_score
+        assert full["reasons"][i] == single.reasons
+
+    assert any("shared_link_burst" in signals for signals in full["signals"])
+
+
+def test_link_burst_off_without_lookup(campaign, link_tweets):
+    tweet = link_tweets[0]
+    assert campaign.burst(tweet.entities.urls) >= 10
+    assert buzzer_detector.detect(tweet).features["shared_link_burst"] == 0.0
+    assert buzzer_detector.detect(tweet, link_burst=campaign.burst).features["shared_link_burst"] >= 10
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="process start from /proc")
+def test_timings_include_time_before_import():
+    code = (
+        "import time; time.sleep(0.3)\n"
+        "from app.utils.profiling import startup_profile\n"
+        "startup_profile.mark('imported')\n"
+        "print(startup_profile.report()['since_start_ms']['imported'])\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert float(out.stdout) >= 300
@@ -0,0 +1,31 @@
+from app.models.buzzer_detector import buzzer_detector
+
+
+def test_lazy_matches_full_verdicts(random_tweets):
+    for tweet in random_tweets:
+        full = buzzer_detector.detect(tweet)
+        lazy = buzzer_detector.detect(tweet, explain=False)
+        assert lazy.is_buzzer == full.is_buzzer, tweet.id
+
+
+def test_sample_covers_both_verdicts(random_tweets):
+    verdicts = {buzzer_detector.detect(t).is_buzzer for t in random_tweets}
+    assert verdicts == {True, False}
+
+
+def test_threshold_tie_agrees(make_tweet):
+    """Weights summing to exactly the threshold, added in different orders"""
+
+    # follower ratio + hashtags + pattern + caps + emojis + retweets = 0.70
+    tweet = make_tweet(
+        text="BREAKING: HOAX VIRAL 🔥 😀 🎉 ✨ 💥 ok",
+        followers=10,
+        following=500,
+        retweets=20,
+        hashtags=["a", "b", "c", "d"],
+    )
+
+    full = buzzer_detector.detect(tweet)
+    lazy = buzzer_detector.detect(tweet, explain=False)
+    assert full.buzzer_score == 0.7
+    assert full.is_buzzer and lazy.is_buzzer
@@ -0,0 +1,51 @@
+import random
+import string
+
+from app.models.sentiment import SentimentScorer, load_lexicon
+
+
+def test_phrases_match_exactly():
+    scorer = SentimentScorer({'luar biasa': 2.0, 'gagal': -1.0})
+
+    scores = scorer.score_texts(["Ini LUAR BIASA!", "luar", "gagal, GAGAL"])
+
+    assert scores.tolist() == [[2.0, 0.0], [0.0, 0.0], [0.0, 2.0]]
+
+
+def test_large_lexicon_ignores_words_outside_it():
+    rng = random.Random(1)
+
+    def word():
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+    lexicon = {word(): rng.choice([1.0, -1.0]) for _ in range(10000)}
+    texts = [" ".join(word() for _ in range(20)) for _ in range(2000)]
+    texts = [text for text in texts if not any(w in lexicon for w in text.split())]
+
+    assert not SentimentScorer(lexicon).score_texts(texts).any()
+
+
+def test_classify():
+    scorer = SentimentScorer()
+
+    assert scorer.classify(["gagal total, korupsi"]) == 'negative'
+    assert scorer.classify(["mantap, sukses"]) == 'positive'
+    assert scorer.classify(["halo semua"]) == 'neutral'
+    assert SentimentScorer({}).classify(["bagus"]) == 'neutral'
+
+
+def test_terms_are_normalized_like_texts():
+    scorer = SentimentScorer({'Luar  Biasa!': 2.0, 'GAGAL': -1.0, '!!!': 5.0})
+
+    assert scorer.score_texts(["luar biasa, gagal"]).tolist() == [[2.0, 1.0]]
+
+
+def test_malformed_lexicon_lines_are_skipped(tmp_path, capsys):
+    path = tmp_path / "lexicon.tsv"
+    path.write_text("# comment\nbagus\t1\nno tab here\nburuk\tvery\nGagal\t-1\n", encoding="utf-8")
+
+    lexicon = load_lexicon(str(path))
+
+    assert lexicon == {'bagus': 1.0, 'Gagal': -1.0}
+    assert f"{path}:3" in capsys.readouterr().out
+    assert SentimentScorer(lexicon).classify(["gagal"]) == 'negative'
@@ -0,0 +1,70 @@
+import multiprocessing
+
+import pytest
+
+from app.services.shared_state import SharedCounters, SharedResultCache
+
+
+WORKERS = 4
+INCREMENTS = 5000
+KEYS = 50
+
+
+def count_and_cache(counters_path: str, cache_path: str) -> int:
+    """Worker: bump a counter, rewrite and read back cache records"""
+
+    counters = SharedCounters(['tweets', 'buzzers'], path=counters_path)
+    cache = SharedResultCache(capacity=1024, width=3, path=cache_path)
+    torn = 0
+
+    for k in range(INCREMENTS):
+        counters.add('tweets')
+        cache.put(f'tweet-{k % KEYS}', (k, k, k))
+
+        cached = cache.get(f'tweet-{(k + 7) % KEYS}')
+        if cached is not None and len(set(cached[0])) != 1:
+            torn += 1
+
+    return torn
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'counters'), str(tmp_path / 'results')
+
+
+def test_counters_and_cache_across_processes(paths):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(WORKERS) as pool:
+        torn = pool.starmap(count_and_cache, [paths] * WORKERS)
+
+    # No increment lost, no record read half-written
+    counters = SharedCounters(['tweets', 'buzzers'], path=paths[0])
+    assert counters.get('tweets') == WORKERS * INCREMENTS
+    assert counters.get('buzzers') == 0
+    assert torn == [0] * WORKERS
+
+    # Dead workers' counts are kept, so a late restore must not overwrite them
+    assert counters.restore({'tweets': 1}) is False
+    assert counters.get('tweets') == WORKERS * INCREMENTS
+
+
+def test_restore_seeds_fresh_counters(paths):
+    counters = SharedCounters(['tweets', 'buzzers'], path=paths[0])
+
+    assert counters.restore({'tweets': 10, 'unknown': 3}) is True
+    counters.add('tweets', 2)
+
+    reopened = SharedCounters(['tweets', 'buzzers'], path=paths[0])
+    assert reopened.get('tweets') == 12
+
+
+def test_cache_expiry_and_miss(paths):
+    cache = SharedResultCache(capacity=16, width=3, path=paths[1])
+    cache.put('tweet-1', (0.8, 1.0, 0.75))
+
+    values, _ = cache.get('tweet-1')
+    assert values == (0.8, 1.0, 0.75)
+    assert cache.get('tweet-2') is None
+    assert cache.get('tweet-1', max_age=-1) is None
+    assert cache.get_stats()['hits'] == 1
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.state_store import (
+    FileStateStore,
+    StateManager,
+    create_state_store,
+)
+
+
+SNAPSHOTS = {"counter": {"value": 3, "items": [1, 2]}, "other": {"x": "y"}}
+
+
+@pytest.mark.parametrize("backend, name", [("sqlite", "state.db"), ("file", "state")])
+def test_store_roundtrip(tmp_path, backend, name):
+    store = create_state_store(backend, str(tmp_path / "nested" / name))
+    assert store.load() == {}
+
+    store.save(SNAPSHOTS)
+    store.save({"counter": {"value": 4}})
+    store.close()
+
+    reopened = create_state_store(backend, str(tmp_path / "nested" / name))
+    assert reopened.load() == {**SNAPSHOTS, "counter": {"value": 4}}
+    reopened.close()
+
+
+def test_file_store_skips_corrupt_snapshots(tmp_path):
+    store = FileStateStore(str(tmp_path))
+    store.save(SNAPSHOTS)
+    (tmp_path / "broken.json").write_text('{"value": ', encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not a snapshot", encoding="utf-8")
+
+    assert store.load() == SNAPSHOTS
+
+
+def test_unknown_backend_is_rejected():
+    assert create_state_store("none", "unused") is None
+    with pytest.raises(ValueError):
+        create_state_store("bogus", "unused")
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def get_state(self):
+        value = self.value
+        return lambda: {"value": value}
+
+    def load_state(self, state):
+        self.value = state["value"]
+
+
+class SlowStore:
+    """Records saves in the order they finish; the first one is slow"""
+
+    def __init__(self):
+        self.saved = []
+        self.closed = False
+        self.started = threading.Event()
+
+    def save(self, snapshots):
+        assert not self.closed
+        first = not self.started.is_set()
+        self.started.set()
+        if first:
+            time.sleep(0.3)
+        self.saved.append(snapshots["counter"]["value"])
+
+    def load(self):
+        return {}
+
+    def close(self):
+        self.closed = True
+
+
+def test_stop_waits_for_in_flight_save():
+    counter, store = Counter(), SlowStore()
+    manager = StateManager()
+    manager.register("counter", counter)
+    manager.open(store)
+
+    async def run():
+        counter.value = 1
+        manager.start(0.01)
+        await asyncio.to_thread(store.started.wait)
+        counter.value = 2
+        await manager.stop()
+
+    asyncio.run(run())
+    assert store.saved == [1, 2]  # the final snapshot lands last
+    assert store.closed
+
+
+def test_lifespan_restores_snapshot(tmp_path, monkeypatch):
+    from app.main import app
+    from app.services.author_risk import author_risk_store
+
+    monkeypatch.setattr(settings, "state_store_backend", "file")
+    monkeypatch.setattr(settings, "state_store_path", str(tmp_path))
+
+    author_id = "lifespan-author"
+    source = type(author_risk_store)(capacity=8)
+    source.update(author_id, "t1", True, score=0.9)
+    FileStateStore(str(tmp_path)).save({"author_risk": source.get_state()()})
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            return author_risk_store.get(author_id)
+
+    assert asyncio.run(run())["tweet_count"] == 1
@@ -0,0 +1,97 @@
+import itertools
+import random
+
+import pytest
+
+from app.models.topic_clustering import TopicClusterer
+from app.utils.loadtest import TOPICS, synthetic_tweets
+
+
+CAMPAIGN = ["SaveX", "SaveXNow", "DukungX", "XBisa"]
+
+
+@pytest.fixture(scope="module")
+def mock_hashtags():
+    """Hashtags of the backend-style mock stream: 5 topics"""
+    tweets = itertools.islice(synthetic_tweets(seed=1), 5000)
+    return [tweet['entities']['hashtags'] for tweet in tweets]
+
+
+def topic_of(groups):
+    return {row: label for label, rows in groups.items() for row in rows}
+
+
+def assert_topics_intact(groups, hashtags):
+    """Every tweet sits in the topic of its mock topic's first hashtag"""
+    first_tags = {tags[0] for tags, _ in TOPICS} & {tags[0] for tags in hashtags}
+    labels = topic_of(groups)
+
+    assert set(groups) >= first_tags
+    for row, tags in enumerate(hashtags):
+        if tags[0] in first_tags:
+            assert labels[row] == tags[0]
+
+
+def test_mock_topics(mock_hashtags):
+    groups = TopicClusterer().cluster(mock_hashtags)
+
+    assert len(groups) == len(TOPICS)
+    assert_topics_intact(groups, mock_hashtags)
+
+
+@pytest.mark.parametrize("share", [0.3, 0.6])
+def test_hub_tag_does_not_chain_topics(mock_hashtags, share):
+    rng = random.Random(3)
+    hashtags = [
+        tags + ["Indonesia"] if rng.random() < share else tags
+        for tags in mock_hashtags
+    ]
+
+    assert_topics_intact(TopicClusterer().cluster(hashtags), hashtags)
+
+
+@pytest.mark.parametrize("topics", [2, 5])
+def test_cross_topic_hub_pair_does_not_chain_topics(mock_hashtags, topics):
+    """Viral/Trending on every buzzer tweet, whatever its topic"""
+    first_tags = [tags[0] for tags, _ in TOPICS[:topics]]
+    hashtags = [
+        tags + ["Viral", "Trending"] if len(tags) == 3 else tags
+        for tags in mock_hashtags
+        if tags[0] in first_tags
+    ]
+
+    groups = TopicClusterer().cluster(hashtags)
+
+    assert sorted(groups) == sorted(first_tags)
+    assert_topics_intact(groups, hashtags)
+
+
+def test_rotating_campaign_merges_next_to_hub(mock_hashtags):
+    rng = random.Random(5)
+    hashtags = []
+    for tags in mock_hashtags:
+        if rng.random() < 0.15:
+            tags = rng.sample(CAMPAIGN, 2)
+        if rng.random() < 0.3:
+            tags = tags + ["Indonesia"]
+        hashtags.append(tags)
+
+    groups = TopicClusterer().cluster(hashtags)
+    labels = topic_of(groups)
+
+    campaign_rows = [row for row, tags in enumerate(hashtags) if tags[0] in CAMPAIGN]
+    assert len({labels[row] for row in campaign_rows}) == 1
+    assert labels[campaign_rows[0]] in CAMPAIGN
+    assert len(groups) == len(TOPICS) + 1
+
+
+def test_case_insensitive_labels_and_untagged_rows():
+    groups = TopicClusterer().cluster([
+        ["Pilpres"], ["pilpres"], ["PILPRES", "Demokrasi"], [], ["Pilpres"],
+    ])
+
+    assert groups == {"Pilpres": [0, 1, 2, 4]}
+
+
+def test_no_hashtags():
+    assert TopicClusterer().cluster([[], []]) == {}
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.schemas.columnar import TweetColumns
+from app.schemas.tweet import TrendingTopicRequest
+from app.services.trending_jobs import TrendingJobManager, trending_job_manager
+
+
+def request_body(make_tweet, tag: str = "SubsidiBBM") -> bytes:
+    tweets = [
+        make_tweet(id=str(i), author_id=f"a{i}", hashtags=[tag]).model_dump(mode="json")
+        for i in range(6)
+    ]
+    return json.dumps({"tweets": tweets, "min_cluster_size": 2}).encode()
+
+
+@pytest.fixture
+def release():
+    """Holds every job in its worker thread until set"""
+
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocking_analyze(manager: TrendingJobManager, release: threading.Event):
+    analyze = manager._analyze
+
+    def run(job):
+        release.wait(10)
+        return analyze(job)
+
+    return run
+
+
+def submit(manager: TrendingJobManager, body: bytes):
+    request = TrendingTopicRequest.model_validate_json(body)
+    return manager.submit(request.tweets, request.min_cluster_size, body)
+
+
+def test_identical_submissions_share_a_job(make_tweet, release, monkeypatch):
+    manager = TrendingJobManager()
+    monkeypatch.setattr(manager, "_analyze", blocking_analyze(manager, release))
+    body = request_body(make_tweet)
+
+    async def run():
+        first = submit(manager, body)
+        second = submit(manager, body)
+        other = submit(manager, request_body(make_tweet, "IKN"))
+        pending = manager.get_stats()["jobs_pending"]
+
+        release.set()
+        await first.done.wait()
+        await other.done.wait()
+        return first, second, other, pending
+
+    first, second, other, pending = asyncio.run(run())
+    assert first is second and first is not other
+    assert pending == 2
+    assert first.status == "completed" and first.result.analyzed_count == 6
+    manager.shutdown()
+
+
+def test_finished_jobs_expire_after_ttl(make_tweet):
+    manager = TrendingJobManager()
+    body = request_body(make_tweet)
+
+    async def run():
+        job = submit(manager, body)
+        await job.done.wait()
+        return job
+
+    job = asyncio.run(run())
+    assert manager.get(job.id) is job
+
+    job.finished_at -= settings.cache_ttl_seconds + 1
+    assert manager.get(job.id) is None
+    assert manager.get_stats()["jobs_cached"] == 0
+    manager.shutdown()
+
+
+def test_full_queue_is_rejected(make_tweet, release, monkeypatch):
+    monkeypatch.setattr(settings, "trending_job_max_pending", 1)
+    monkeypatch.setattr(trending_job_manager, "_analyze", blocking_analyze(trending_job_manager, release))
+
+    with TestClient(app) as client:
+        accepted = client.post("/api/trending/jobs", content=request_body(make_tweet))
+        rejected = client.post("/api/trending/jobs", content=request_body(make_tweet, "IKN"))
+        release.set()
+
+    assert accepted.status_code == 202
+    assert rejected.status_code == 503
+    assert rejected.json()["detail"].startswith("Too many pending trending jobs")
+
+
+def test_stream_sends_status_then_result(make_tweet, release, monkeypatch):
+    monkeypatch.setattr(trending_job_manager, "_analyze", blocking_analyze(trending_job_manager, release))
+
+    with TestClient(app) as client:
+        job = client.post("/api/trending/jobs", content=request_body(make_tweet, "KPK")).json()
+        threading.Timer(0.2, release.set).start()
+        stream = client.get(f"/api/trending/jobs/{job['job_id']}/stream")
+
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n", 1) for block in stream.text.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: status", "event: completed"]
+
+    status = json.loads(events[0][1][len("data: "):])
+    final = json.loads(events[1][1][len("data: "):])
+    assert status["status"] in ("queued", "running") and status["result"] is None
+    assert final["job_id"] == job["job_id"] and final["result"]["analyzed_count"] == 6
+
+
+def test_msgpack_job_matches_json_job(make_tweet):
+    body = request_body(make_tweet, "OmnibusLaw")
+    request = TrendingTopicRequest.model_validate_json(body)
+    columns = TweetColumns.from_tweets(request.tweets)
+    packed = msgpack.packb(
+        {**{name: getattr(columns, name) for name in TweetColumns.FIELDS}, "min_cluster_size": 2},
+        use_bin_type=True,
+    )
+
+    def run(client, content, headers=None):
+        job = client.post("/api/trending/jobs", content=content, headers=headers).json()
+        stream = client.get(f"/api/trending/jobs/{job['job_id']}/stream").text
+        return json.loads(stream.rsplit("data: ", 1)[1])["result"]
+
+    with TestClient(app) as client:
+        from_json = run(client, body)
+        from_msgpack = run(client, packed, {"content-type": "application/x-msgpack"})
+
+    assert from_msgpack["analyzed_count"] == 6
+    assert from_msgpack["topics"] == from_json["topics"]
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def ws():
+    with TestClient(app).websocket_connect("/ws/detect") as websocket:
+        assert websocket.receive_json() == {"type": "hello", "credits": settings.ws_credit_window}
+        yield websocket
+
+
+def tweet_payload(make_tweet, i: int) -> dict:
+    return make_tweet(id=f"ws-{i}", author_id=f"ws-author-{i}").model_dump()
+
+
+def test_detect_returns_result_and_credit(ws, make_tweet):
+    ws.send_json({"type": "detect", "id": "a", "tweet": tweet_payload(make_tweet, 1)})
+
+    message = ws.receive_json()
+    assert message["type"] == "result"
+    assert message["id"] == "a"
+    assert message["credits"] == 1
+    assert message["result"]["tweet_id"] == "ws-1"
+
+
+def test_binary_frame_is_an_error_not_a_disconnect(ws, make_tweet):
+    ws.send_bytes(b"\x00")
+    ws.send_text("not json")
+
+    for _ in range(2):
+        message = ws.receive_json()
+        assert message["type"] == "error"
+        assert message["credits"] == 0
+
+    # The connection is still usable
+    ws.send_json({"type": "detect", "id": "b", "tweet": tweet_payload(make_tweet, 2)})
+    assert ws.receive_json()["id"] == "b"
+
+
+def test_messages_over_the_credit_window_are_rejected(make_tweet, monkeypatch):
+    monkeypatch.setattr(settings, "ws_credit_window", 5)
+    tweets = [tweet_payload(make_tweet, i) for i in range(6)]
+
+    with TestClient(app).websocket_connect("/ws/detect") as websocket:
+        assert websocket.receive_json()["credits"] == 5
+
+        websocket.send_json({"type": "batch", "id": "big", "tweets": tweets})
+        message = websocket.receive_json()
+        assert message["type"] == "error"
+        assert message["error"] == "Not enough credits (5 left, 6 needed)"
+
+        websocket.send_json({"type": "batch", "id": "fits", "tweets": tweets[:5]})
+        message = websocket.receive_json()
+        assert message["type"] == "batch_result"
+        assert message["credits"] == 5
+
+
+def test_repeated_rejections_close_the_connection(make_tweet, monkeypatch):
+    monkeypatch.setattr(settings, "ws_max_rejected", 3)
+
+    with TestClient(app).websocket_connect("/ws/detect") as websocket:
+        websocket.receive_json()
+
+        # An accepted message resets the count
+        for _ in range(3):
+            websocket.send_text("not json")
+        websocket.send_json({"type": "detect", "id": "ok", "tweet": tweet_payload(make_tweet, 3)})
+        for _ in range(3):
+            websocket.send_bytes(b"\x00")
+
+        replies = [websocket.receive_json() for _ in range(7)]
+        assert [m["type"] for m in replies].count("error") == 6
+        assert any(m["id"] == "ok" for m in replies)
+
+        websocket.send_bytes(b"\x00")
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+        assert closed.value.code == 1008